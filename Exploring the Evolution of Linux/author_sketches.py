@@ -0,0 +1,185 @@
+"""Bounded-memory author statistics for very large or federated git logs.
+
+``len(git_log['author'].dropna().unique())`` and ``value_counts()`` need a
+hash table holding every author. When logs from thousands of repositories
+are combined that table no longer fits, so this module offers sketches
+whose size is fixed up front:
+
+* :class:`HyperLogLog` estimates the number of distinct authors with a
+  relative standard error of ``1.04 / sqrt(2 ** precision)``.
+* :class:`SpaceSaving` keeps ``capacity`` counters for the most frequent
+  authors. Every reported count ``c`` with error ``e`` brackets the true
+  count as ``c - e <= true <= c``, and no author is overestimated by more
+  than ``commits / capacity``.
+
+Both sketches merge, so shards and files can be summarized independently
+and combined afterwards (see :meth:`AuthorSketch.merge`).
+
+Usage from the notebook directory::
+
+    from author_sketches import sketch_author_stats
+
+    sketch = sketch_author_stats('datasets/git_log.gz')
+    sketch.number_of_authors()   # (estimate, standard error)
+    sketch.top_authors(10)       # count, error and guaranteed lower bound
+"""
+
+import numpy as np
+import pandas as pd
+
+from git_log_stream import CHUNKSIZE, GIT_LOG_PATH, read_git_log_chunks
+
+
+def hash_authors(authors):
+    """Stable 64-bit hashes of author names."""
+    return pd.util.hash_array(np.asarray(authors, dtype=object))
+
+
+def bit_length(values):
+    """Vectorized ``int.bit_length`` for uint64 arrays."""
+    values = values.copy()
+    length = np.zeros(len(values), dtype='int64')
+    for shift in (32, 16, 8, 4, 2, 1):
+        high = values >= (np.uint64(1) << np.uint64(shift))
+        length[high] += shift
+        values[high] >>= np.uint64(shift)
+    return length + (values > 0)
+
+
+class HyperLogLog:
+    """Distinct-count sketch with ``2 ** precision`` one-byte registers."""
+
+    def __init__(self, precision=14):
+        if not 4 <= precision <= 18:
+            raise ValueError('precision must be between 4 and 18')
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype='uint8')
+
+    def add_hashes(self, hashes):
+        p = np.uint64(self.precision)
+        buckets = (hashes >> (np.uint64(64) - p)).astype('int64')
+        rest = hashes & ((np.uint64(1) << (np.uint64(64) - p)) - np.uint64(1))
+        ranks = (64 - self.precision) - bit_length(rest) + 1
+        np.maximum.at(self.registers, buckets, ranks.astype('uint8'))
+        return self
+
+    def add(self, values):
+        return self.add_hashes(hash_authors(values))
+
+    def merge(self, other):
+        if other.precision != self.precision:
+            raise ValueError('cannot merge sketches with different precision')
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    @property
+    def standard_error(self):
+        return 1.04 / np.sqrt(len(self.registers))
+
+    def estimate(self):
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / np.sum(np.ldexp(1.0, -self.registers.astype('int64')))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if raw <= 2.5 * m and zeros:
+            # linear counting is more accurate for small cardinalities
+            return m * np.log(m / zeros)
+        return raw
+
+
+class SpaceSaving:
+    """Heavy-hitter sketch that keeps at most ``capacity`` counters."""
+
+    def __init__(self, capacity=1000):
+        self.capacity = capacity
+        self.counts = {}
+        self.errors = {}
+        self.total = 0
+
+    def min_count(self):
+        if len(self.counts) < self.capacity:
+            return 0
+        return min(self.counts.values())
+
+    @classmethod
+    def from_counts(cls, item_counts, capacity=1000):
+        """Summary of exact counts, truncated to the ``capacity`` largest."""
+        sketch = cls(capacity)
+        items = sorted(item_counts, key=item_counts.get, reverse=True)[:capacity]
+        sketch.counts = {item: item_counts[item] for item in items}
+        sketch.errors = dict.fromkeys(items, 0)
+        sketch.total = sum(item_counts.values())
+        return sketch
+
+    def update(self, item_counts):
+        """Add weighted occurrences, e.g. one chunk's ``value_counts()``.
+
+        The chunk is summarized exactly and merged, which costs one sort of
+        at most ``2 * capacity`` counters instead of one eviction per item.
+        """
+        return self.merge(SpaceSaving.from_counts(item_counts, self.capacity))
+
+    def merge(self, other):
+        """Combine two summaries; an absent item is charged the other's minimum."""
+        own_floor, other_floor = self.min_count(), other.min_count()
+        counts, errors = {}, {}
+        for item in self.counts.keys() | other.counts.keys():
+            counts[item] = self.counts.get(item, own_floor) + other.counts.get(item, other_floor)
+            errors[item] = (self.errors.get(item, own_floor)
+                            + other.errors.get(item, other_floor))
+        kept = sorted(counts, key=counts.get, reverse=True)[:self.capacity]
+        self.counts = {item: counts[item] for item in kept}
+        self.errors = {item: errors[item] for item in kept}
+        self.total += other.total
+        return self
+
+    @property
+    def error_bound(self):
+        return self.total / self.capacity
+
+    def top(self, n=5):
+        items = sorted(self.counts, key=self.counts.get, reverse=True)[:n]
+        top = pd.DataFrame({'count': [self.counts[item] for item in items],
+                            'error': [self.errors[item] for item in items]},
+                           index=pd.Index(items, name='author'))
+        top['guaranteed'] = top['count'] - top['error']
+        return top
+
+
+class AuthorSketch:
+    """Distinct-author and top-author sketches for a stream of log chunks."""
+
+    def __init__(self, precision=14, capacity=1000):
+        self.number_of_commits = 0
+        self.distinct = HyperLogLog(precision)
+        self.heavy_hitters = SpaceSaving(capacity)
+
+    def update(self, chunk):
+        self.number_of_commits += len(chunk)
+        authors = chunk['author'].dropna()
+        self.distinct.add(authors)
+        self.heavy_hitters.update(authors.value_counts(sort=False).to_dict())
+        return self
+
+    def merge(self, other):
+        self.number_of_commits += other.number_of_commits
+        self.distinct.merge(other.distinct)
+        self.heavy_hitters.merge(other.heavy_hitters)
+        return self
+
+    def number_of_authors(self):
+        """Estimated distinct authors and the estimate's standard error."""
+        estimate = self.distinct.estimate()
+        return int(round(estimate)), float(estimate * self.distinct.standard_error)
+
+    def top_authors(self, n=5):
+        """Approximate ``value_counts().head(n)`` with per-author error bounds."""
+        return self.heavy_hitters.top(n)
+
+
+def sketch_author_stats(path=GIT_LOG_PATH, chunksize=CHUNKSIZE, precision=14, capacity=1000):
+    """Stream ``path`` into an :class:`AuthorSketch`."""
+    sketch = AuthorSketch(precision, capacity)
+    for chunk in read_git_log_chunks(path, chunksize):
+        sketch.update(chunk)
+    return sketch
@@ -0,0 +1,188 @@
+"""Benchmark harness for the commit-history pipeline.
+
+Generates synthetic ``timestamp#author`` logs of any size (newest commit
+first, Zipf-distributed authors, a sprinkle of bogus 1970/2030 timestamps
+like the real Linux log) and times every stage of the notebook pipeline,
+optionally with the peak traced memory of each stage. Results are appended
+to a JSON-lines file, one record per engine, size and stage, so runs can be
+compared across commits or engines.
+
+Engines:
+
+* ``notebook``: the notebook's cells (read, ``to_datetime``, range filter,
+  ``value_counts``, yearly ``Grouper`` count, bar plot).
+* ``stream``: :func:`git_log_stream.stream_commit_stats`.
+* ``parallel``: :func:`git_log_parallel.parallel_commit_stats`.
+* ``sketch``: :func:`author_sketches.sketch_author_stats`.
+
+Example::
+
+    python benchmark_git_log.py --rows 100000 1000000 10000000 \\
+        --engines notebook stream parallel --output benchmark_results.jsonl
+"""
+
+import argparse
+import gzip
+import json
+import os
+import platform
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+FIRST_COMMIT = 1113690036  # 2005-04-16, the first commit of the Linux log
+LAST_COMMIT = 1511999999   # end of 2017
+GENERATE_CHUNK_ROWS = 1_000_000
+
+
+def generate_git_log(path, rows, authors=20000, skew=1.3, bogus_rate=1e-4, seed=0):
+    """Write a synthetic gzip ``timestamp#author`` log with ``rows`` records."""
+    rng = np.random.default_rng(seed)
+    with gzip.open(path, 'wt', encoding='latin-1', compresslevel=1) as f:
+        for start in range(0, rows, GENERATE_CHUNK_ROWS):
+            stop = min(start + GENERATE_CHUNK_ROWS, rows)
+            # newest first, like ``git log``
+            position = np.arange(start, stop) / max(rows - 1, 1)
+            timestamps = (LAST_COMMIT - position * (LAST_COMMIT - FIRST_COMMIT)).astype('int64')
+            timestamps -= rng.integers(0, 3600, stop - start)
+            bogus = rng.random(stop - start) < bogus_rate
+            timestamps[bogus] = rng.choice([0, 1, 1900000000, 2000000000], bogus.sum())
+            if stop == rows:
+                timestamps[-1] = FIRST_COMMIT
+            author_ids = np.minimum(rng.zipf(skew, stop - start), authors)
+            chunk = pd.DataFrame({'timestamp': timestamps,
+                                  'author': pd.Series(author_ids).map('Author {}'.format)})
+            chunk.to_csv(f, sep='#', header=False, index=False)
+    return path
+
+
+@contextmanager
+def measure(results, stage, trace_memory):
+    """Record wall time and, optionally, the traced memory peak of a stage."""
+    if trace_memory:
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+    started = time.perf_counter()
+    yield
+    record = {'stage': stage, 'seconds': time.perf_counter() - started}
+    if trace_memory:
+        record['peak_bytes'] = tracemalloc.get_traced_memory()[1] - before
+    results.append(record)
+
+
+def run_notebook(path, results, trace_memory, plot=True):
+    with measure(results, 'read', trace_memory):
+        git_log = pd.read_csv(path, sep='#', encoding='latin-1', header=None,
+                              names=['timestamp', 'author'])
+    with measure(results, 'to_datetime', trace_memory):
+        git_log['timestamp'] = pd.to_datetime(git_log['timestamp'], unit='s')
+    with measure(results, 'range_filter', trace_memory):
+        first_commit_timestamp = git_log.iloc[-1]['timestamp']
+        last_commit_timestamp = pd.to_datetime('2018')
+        corrected_log = git_log[(git_log['timestamp'] >= first_commit_timestamp)
+                                & (git_log['timestamp'] <= last_commit_timestamp)]
+    with measure(results, 'value_counts', trace_memory):
+        git_log['author'].value_counts().head()
+    with measure(results, 'yearly_count', trace_memory):
+        commits_per_year = corrected_log.groupby(pd.Grouper(key='timestamp', freq='YS')).count()
+    if plot:
+        import matplotlib
+        matplotlib.use('Agg')
+        import matplotlib.pyplot as plt
+        with measure(results, 'bar_plot', trace_memory):
+            ax = commits_per_year.plot(kind='bar', title='Commits per year (Linux kernel)',
+                                       legend=False)
+            ax.figure.canvas.draw()
+            plt.close(ax.figure)
+
+
+def run_stream(path, results, trace_memory):
+    from git_log_stream import stream_commit_stats
+    with measure(results, 'ingest', trace_memory):
+        stats = stream_commit_stats(path)
+    with measure(results, 'results', trace_memory):
+        stats.top_authors()
+        stats.commits_per_year()
+
+
+def run_parallel(path, results, trace_memory):
+    from git_log_parallel import parallel_commit_stats
+    # worker processes are not traced, only the coordinating process
+    with measure(results, 'ingest', trace_memory):
+        stats = parallel_commit_stats(path)
+    with measure(results, 'results', trace_memory):
+        stats.top_authors()
+        stats.commits_per_year()
+
+
+def run_sketch(path, results, trace_memory):
+    from author_sketches import sketch_author_stats
+    with measure(results, 'ingest', trace_memory):
+        sketch = sketch_author_stats(path)
+    with measure(results, 'results', trace_memory):
+        sketch.number_of_authors()
+        sketch.top_authors()
+
+
+ENGINES = {
+    'notebook': run_notebook,
+    'stream': run_stream,
+    'parallel': run_parallel,
+    'sketch': run_sketch,
+}
+
+
+def benchmark(rows, engines, output, trace_memory=True, workdir=None, keep_logs=False):
+    """Generate one log per size, run every engine on it, append results."""
+    environment = {
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'machine': platform.machine(),
+        'cpus': os.cpu_count(),
+    }
+    workdir = workdir or tempfile.gettempdir()
+    for n in rows:
+        path = os.path.join(workdir, 'git_log_%d.gz' % n)
+        if not os.path.exists(path):
+            generate_git_log(path, n)
+        try:
+            for engine in engines:
+                results = []
+                if trace_memory:
+                    tracemalloc.start()
+                try:
+                    ENGINES[engine](path, results, trace_memory)
+                finally:
+                    if trace_memory:
+                        tracemalloc.stop()
+                with open(output, 'a', encoding='utf-8') as f:
+                    for record in results:
+                        record.update(engine=engine, rows=n, **environment)
+                        f.write(json.dumps(record) + '\n')
+                print('%-9s %12d rows  %8.3f s' % (engine, n, sum(r['seconds'] for r in results)))
+        finally:
+            if not keep_logs:
+                os.remove(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--rows', type=int, nargs='+', default=[10**5, 10**6, 10**7])
+    parser.add_argument('--engines', nargs='+', choices=sorted(ENGINES), default=['notebook', 'stream'])
+    parser.add_argument('--output', default='benchmark_results.jsonl')
+    parser.add_argument('--no-memory', action='store_true',
+                        help='skip tracemalloc, which slows down allocation-heavy stages')
+    parser.add_argument('--workdir', help='where the synthetic logs are written')
+    parser.add_argument('--keep-logs', action='store_true')
+    args = parser.parse_args()
+    benchmark(args.rows, args.engines, args.output, not args.no_memory,
+              args.workdir, args.keep_logs)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,166 @@
+"""Sorted-timestamp index over the git log for fast range queries.
+
+The notebook selects a time window with a boolean mask over the whole log,
+which scans every row and copies the selection. Dashboards ask for many
+windows (per month, per release, per author), so this index sorts the
+commit timestamps once and answers every query with binary searches:
+
+* ``count(start, end)`` is two ``searchsorted`` calls.
+* ``counts_per('Y' | 'M' | 'D', start, end)`` slices a prefix-sum table of
+  bucket start positions, so its cost is the number of buckets returned.
+* ``author_count(author, start, end)`` searches the author's own sorted
+  timestamps.
+* ``top_authors(start, end, n)`` adds the precomputed per-month author
+  counts of the whole months inside the window and scans only the two
+  partial months at its edges.
+
+Windows are inclusive on both ends, like the notebook's
+``(timestamp >= first) & (timestamp <= last)`` filter. Commits without an
+author are counted by ``count`` and ``counts_per`` but never attributed.
+
+Usage from the notebook directory::
+
+    from git_log_cache import load_git_log
+    from commit_index import CommitIndex
+
+    index = CommitIndex.from_frame(load_git_log('datasets/git_log.gz'))
+    index.count('2016-01', '2016-06')
+    index.top_authors('2016-01-01', '2017-01-01', n=10)
+"""
+
+import numpy as np
+import pandas as pd
+
+from git_log_stream import to_epoch_seconds
+
+BUCKET_UNITS = {'D': 'datetime64[D]', 'M': 'datetime64[M]', 'Y': 'datetime64[Y]'}
+BUCKET_FREQS = {'D': 'D', 'M': 'MS', 'Y': 'YS'}
+
+
+def to_seconds(timestamps):
+    """Epoch seconds of a Series of epoch seconds or datetimes."""
+    if pd.api.types.is_datetime64_any_dtype(timestamps):
+        return timestamps.to_numpy().astype('datetime64[s]').astype('int64')
+    return timestamps.to_numpy().astype('int64')
+
+
+def bucket_starts(seconds, freq):
+    """Start (epoch seconds) of the ``freq`` bucket of every value."""
+    return seconds.astype('datetime64[s]').astype(BUCKET_UNITS[freq]) \
+        .astype('datetime64[s]').astype('int64')
+
+
+class CommitIndex:
+    """Commit timestamps sorted once, with day/month/year bucket tables."""
+
+    def __init__(self, seconds, author_codes, authors):
+        order = np.argsort(seconds, kind='stable')
+        self.timestamps = seconds[order]
+        self.author_codes = author_codes[order]
+        self.authors = pd.Index(authors)
+
+        # per-bucket start position in ``timestamps``; differences are counts
+        self.buckets = {}
+        for freq in BUCKET_UNITS:
+            starts = np.unique(bucket_starts(self.timestamps, freq))
+            positions = np.searchsorted(self.timestamps, starts, side='left')
+            self.buckets[freq] = (starts, np.append(positions, len(self.timestamps)))
+
+        # every author's commit timestamps, sorted, concatenated by author code
+        attributed = self.author_codes >= 0
+        by_author = np.argsort(self.author_codes[attributed], kind='stable')
+        self.author_timestamps = self.timestamps[attributed][by_author]
+        self.author_offsets = np.zeros(len(self.authors) + 1, dtype='int64')
+        np.cumsum(np.bincount(self.author_codes[attributed], minlength=len(self.authors)),
+                  out=self.author_offsets[1:])
+
+        # sparse month x author counts (CSR): months are rows, authors columns
+        months, month_positions = self.buckets['M']
+        month_of_row = np.repeat(np.arange(len(months)), np.diff(month_positions))
+        keys = month_of_row[attributed] * len(self.authors) + self.author_codes[attributed]
+        keys, counts = np.unique(keys, return_counts=True)
+        self.month_author_codes = (keys % max(len(self.authors), 1)).astype('int64')
+        self.month_author_counts = counts
+        self.month_author_ptr = np.searchsorted(keys // max(len(self.authors), 1),
+                                                np.arange(len(months) + 1))
+
+    @classmethod
+    def from_frame(cls, git_log):
+        """Build the index from a ``timestamp``/``author`` frame.
+
+        ``timestamp`` may hold epoch seconds or datetimes; rows without a
+        timestamp are skipped.
+        """
+        git_log = git_log[git_log['timestamp'].notna()]
+        authors = git_log['author'].astype('category')
+        return cls(to_seconds(git_log['timestamp']),
+                   authors.cat.codes.to_numpy().astype('int64'),
+                   authors.cat.categories)
+
+    def positions(self, start=None, end=None):
+        """``[lo, hi)`` slice of ``timestamps`` inside the inclusive window."""
+        lo = 0 if start is None else np.searchsorted(
+            self.timestamps, to_epoch_seconds(start), side='left')
+        hi = len(self.timestamps) if end is None else np.searchsorted(
+            self.timestamps, to_epoch_seconds(end), side='right')
+        return int(lo), int(max(lo, hi))
+
+    def count(self, start=None, end=None):
+        lo, hi = self.positions(start, end)
+        return hi - lo
+
+    def counts_per(self, freq='Y', start=None, end=None):
+        """Commits per day, month or year inside the window, zeros included."""
+        lo, hi = self.positions(start, end)
+        starts, positions = self.buckets[freq]
+        first = np.searchsorted(positions, lo, side='right') - 1
+        last = np.searchsorted(positions, hi, side='left')
+        clipped = np.clip(positions[first:last + 1], lo, hi)
+        counts = pd.Series(np.diff(clipped), index=pd.to_datetime(starts[first:last], unit='s'),
+                           name='commits')
+        counts = counts[counts > 0]
+        counts.index.name = 'timestamp'
+        if counts.empty:
+            return counts
+        return counts.asfreq(BUCKET_FREQS[freq], fill_value=0)
+
+    def author_count(self, author, start=None, end=None):
+        """Commits of one author inside the window."""
+        code = self.authors.get_indexer([author])[0]
+        if code < 0:
+            return 0
+        own = self.author_timestamps[self.author_offsets[code]:self.author_offsets[code + 1]]
+        lo = 0 if start is None else np.searchsorted(own, to_epoch_seconds(start), side='left')
+        hi = len(own) if end is None else np.searchsorted(own, to_epoch_seconds(end), side='right')
+        return int(max(hi - lo, 0))
+
+    def author_counts(self, start=None, end=None):
+        """Commits per author code inside the window."""
+        lo, hi = self.positions(start, end)
+        months, positions = self.buckets['M']
+        # whole months inside [lo, hi) come from the precomputed table
+        first = np.searchsorted(positions, lo, side='left')
+        last = np.searchsorted(positions, hi, side='right') - 1
+        totals = np.zeros(len(self.authors), dtype='int64')
+        if first < last:
+            begin, stop = self.month_author_ptr[first], self.month_author_ptr[last]
+            totals += np.bincount(self.month_author_codes[begin:stop],
+                                  weights=self.month_author_counts[begin:stop],
+                                  minlength=len(self.authors)).astype('int64')
+            edges = [(lo, positions[first]), (positions[last], hi)]
+        else:
+            edges = [(lo, hi)]
+        for edge_lo, edge_hi in edges:
+            codes = self.author_codes[edge_lo:edge_hi]
+            totals += np.bincount(codes[codes >= 0], minlength=len(self.authors))
+        return totals
+
+    def top_authors(self, start=None, end=None, n=5):
+        """The ``n`` most active authors inside the window."""
+        totals = self.author_counts(start, end)
+        n = min(n, int((totals > 0).sum()))
+        top = np.argpartition(-totals, n - 1)[:n] if n else np.array([], dtype='int64')
+        top = top[np.argsort(-totals[top], kind='stable')]
+        result = pd.Series(totals[top], index=self.authors[top], name='count')
+        result.index.name = 'author'
+        return result
@@ -0,0 +1,110 @@
+"""Headless commit report rendered from pre-aggregated counts.
+
+Report jobs only need the yearly and per-author totals, which the
+:mod:`commit_store` JSON file already holds. This module reads that file
+with the standard library alone, so a text refresh never imports pandas or
+matplotlib. matplotlib is imported only when an image is actually
+requested, and every chart is drawn once and saved in all requested
+formats.
+
+Example::
+
+    python commit_report.py --store datasets/git_log_stats.json
+    python commit_report.py --store datasets/git_log_stats.json \\
+        --charts-dir reports --formats png svg
+"""
+
+import argparse
+import json
+import os
+
+STORE_PATH = 'datasets/git_log_stats.json'
+CHART_FORMATS = ('png', 'svg')
+
+
+def load_report_data(store_path=STORE_PATH, top=10):
+    """Commits per year and the top authors from a commit-statistics store."""
+    with open(store_path, encoding='utf-8') as f:
+        stats = json.load(f)['stats']
+    year_counts = {int(year): count for year, count in stats['year_counts'].items()}
+    if stats['first_year'] is None:
+        commits_per_year = []
+    else:
+        commits_per_year = [(year, year_counts.get(year, 0))
+                            for year in range(stats['first_year'], stats['last_year'] + 1)]
+    authors = stats['author_counts']
+    top_authors = sorted(authors.items(), key=lambda item: item[1], reverse=True)[:top]
+    return {
+        'number_of_commits': stats['number_of_commits'],
+        'number_of_authors': len(authors),
+        'commits_per_year': commits_per_year,
+        'top_authors': top_authors,
+    }
+
+
+def format_report(data):
+    lines = ['%s authors committed %s code changes.'
+             % (data['number_of_authors'], data['number_of_commits']), '',
+             'Top authors:']
+    lines += ['  %-40s %8d' % (author, count) for author, count in data['top_authors']]
+    lines += ['', 'Commits per year:']
+    lines += ['  %d %8d' % (year, count) for year, count in data['commits_per_year']]
+    return '\n'.join(lines)
+
+
+def bar_chart(labels, values, title, horizontal=False):
+    from matplotlib.figure import Figure
+
+    # a bare Figure avoids pyplot's global state in batch jobs
+    figure = Figure(figsize=(10, 6))
+    ax = figure.add_subplot()
+    positions = range(len(values))
+    if horizontal:
+        ax.barh(positions, values)
+        ax.set_yticks(positions, labels)
+        ax.invert_yaxis()
+    else:
+        ax.bar(positions, values)
+        ax.set_xticks(positions, labels, rotation=90)
+    ax.set_title(title)
+    figure.tight_layout()
+    return figure
+
+
+def render_charts(data, charts_dir, formats=CHART_FORMATS):
+    """Save the commits-per-year and top-author charts; return the paths."""
+    os.makedirs(charts_dir, exist_ok=True)
+    charts = {
+        'commits_per_year': bar_chart([year for year, _ in data['commits_per_year']],
+                                      [count for _, count in data['commits_per_year']],
+                                      'Commits per year (Linux kernel)'),
+        'top_authors': bar_chart([author for author, _ in data['top_authors']],
+                                 [count for _, count in data['top_authors']],
+                                 'Top authors (Linux kernel)', horizontal=True),
+    }
+    paths = []
+    for name, figure in charts.items():
+        for fmt in formats:
+            path = os.path.join(charts_dir, '%s.%s' % (name, fmt))
+            figure.savefig(path, format=fmt)
+            paths.append(path)
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--store', default=STORE_PATH)
+    parser.add_argument('--top', type=int, default=10)
+    parser.add_argument('--charts-dir', help='render charts into this directory')
+    parser.add_argument('--formats', nargs='+', choices=CHART_FORMATS, default=['png'])
+    args = parser.parse_args()
+
+    data = load_report_data(args.store, args.top)
+    print(format_report(data))
+    if args.charts_dir:
+        for path in render_charts(data, args.charts_dir, args.formats):
+            print('wrote %s' % path)
+
+
+if __name__ == '__main__':
+    main()
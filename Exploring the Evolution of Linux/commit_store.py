@@ -0,0 +1,210 @@
+"""Persistent commit statistics that only ingest new ``git_log.gz`` records.
+
+Refreshing the notebook normally rereads the whole log and recomputes
+``value_counts()`` and the yearly ``pd.Grouper`` count. The store below keeps
+the author and year tables of :class:`git_log_stream.CommitStats` in a small
+JSON file together with a high-water mark, and a refresh only parses the
+records that were added since the previous one.
+
+``git log`` writes the newest commit first, so new commits show up at the top
+of the file. The high-water mark is a fingerprint of the first
+:data:`MARK_LINES` raw records seen so far. A single record is not enough:
+cherry-picks and backports keep the author date, so a new commit can repeat
+the newest record's timestamp and author exactly, and the log contains
+bogus dates such as 1970 or 2030. A refresh scans the raw lines for that
+whole sequence; the records in front of it are the new ones, and if it is
+missing the history was rewritten and everything is recomputed.
+
+Usage from the notebook directory::
+
+    from commit_store import CommitStatsStore
+
+    store = CommitStatsStore('datasets/git_log_stats.json')
+    store.refresh('datasets/git_log.gz')
+    top_10_authors = store.stats.top_authors()
+    commits_per_year = store.stats.commits_per_year()
+"""
+
+import gzip
+import hashlib
+import json
+import os
+from collections import Counter, deque
+from itertools import islice
+
+from git_log_stream import (CHUNKSIZE, GIT_LOG_PATH, LAST_COMMIT_TIMESTAMP, CommitStats,
+                            read_git_log_chunks, stream_commit_stats, to_epoch_seconds)
+
+STORE_PATH = 'datasets/git_log_stats.json'
+MARK_LINES = 64
+
+
+def stats_to_dict(stats):
+    return {
+        'lower': stats.lower,
+        'upper': stats.upper,
+        'number_of_commits': stats.number_of_commits,
+        'first_year': stats.first_year,
+        'last_year': stats.last_year,
+        'author_counts': dict(stats.author_counts),
+        'year_counts': {str(year): count for year, count in stats.year_counts.items()},
+    }
+
+
+def stats_from_dict(data):
+    return CommitStats(
+        lower=data['lower'],
+        upper=data['upper'],
+        number_of_commits=data['number_of_commits'],
+        author_counts=Counter(data['author_counts']),
+        year_counts=Counter({int(year): count for year, count in data['year_counts'].items()}),
+        first_year=data['first_year'],
+        last_year=data['last_year'],
+    )
+
+
+def iter_log_records(path=GIT_LOG_PATH):
+    """Raw record lines of the log, skipping blank lines like ``read_csv`` does."""
+    with gzip.open(path, 'rb') as f:
+        for line in f:
+            line = line.rstrip(b'\r\n')
+            if line.strip():
+                yield line
+
+
+def lines_mark(lines):
+    """High-water mark for a sequence of raw record lines."""
+    return {
+        'lines': len(lines),
+        'first_line': lines[0].decode('latin-1') if lines else None,
+        'fingerprint': hashlib.sha1(b'\n'.join(lines)).hexdigest(),
+    }
+
+
+def log_mark(path=GIT_LOG_PATH, mark_lines=MARK_LINES):
+    """High-water mark for the newest ``mark_lines`` records of the log."""
+    return lines_mark(list(islice(iter_log_records(path), mark_lines)))
+
+
+def count_new_records(path, mark, mark_lines=MARK_LINES):
+    """Records in front of ``mark`` and the log's new mark.
+
+    The record count is ``None`` when the marked sequence is not in the log.
+    Only a window of ``mark['lines']`` lines is held in memory.
+
+    A cherry-picked commit keeps its author date, so it can repeat the old
+    newest record exactly; only the whole marked sequence ends the new
+    records:
+
+    >>> import tempfile
+    >>> log = os.path.join(tempfile.mkdtemp(), 'git_log.gz')
+    >>> def write_log(lines):
+    ...     with gzip.open(log, 'wt', encoding='latin-1') as f:
+    ...         f.write('\\n'.join(lines) + '\\n')
+    >>> old = ['1500000000#Alice', '1400000000#Bob', '1300000000#Carol']
+    >>> write_log(old)
+    >>> mark = log_mark(log)
+    >>> write_log(['1510000000#Dave', '1500000000#Alice', '1505000000#Eve'] + old)
+    >>> count_new_records(log, mark)[0]
+    3
+    >>> write_log(old[1:])
+    >>> count_new_records(log, mark)[0] is None
+    True
+
+    The store then ingests all three and counts Alice twice:
+
+    >>> store = CommitStatsStore(os.path.join(os.path.dirname(log), 'stats.json'))
+    >>> write_log(old)
+    >>> store.rebuild(log)
+    3
+    >>> write_log(['1510000000#Dave', '1500000000#Alice', '1505000000#Eve'] + old)
+    >>> store.refresh(log), store.stats.author_counts['Alice'], store.stats.author_counts['Eve']
+    (3, 2, 1)
+    """
+    first_line = mark['first_line'].encode('latin-1') if mark['lines'] else None
+    head, window, position = [], deque(), 0
+    found = not mark['lines']
+    for line in iter_log_records(path):
+        if len(head) < mark_lines:
+            head.append(line)
+        if found:
+            # an empty log was marked: every record is new
+            position += 1
+            continue
+        window.append(line)
+        if len(window) > mark['lines']:
+            window.popleft()
+            position += 1
+        if (len(window) == mark['lines'] and window[0] == first_line
+                and lines_mark(list(window))['fingerprint'] == mark['fingerprint']):
+            found = True
+            break
+    if not found:
+        return None, lines_mark(head)
+    head.extend(islice(iter_log_records(path), len(head), mark_lines))
+    return position, lines_mark(head)
+
+
+class CommitStatsStore:
+    """Author and year commit counts persisted between notebook runs."""
+
+    def __init__(self, path=STORE_PATH, last_commit_timestamp=LAST_COMMIT_TIMESTAMP):
+        self.path = path
+        self.upper = to_epoch_seconds(last_commit_timestamp)
+        self.stats = None
+        self.high_water_mark = None
+        if os.path.exists(path):
+            self.load()
+
+    def load(self):
+        with open(self.path, encoding='utf-8') as f:
+            data = json.load(f)
+        stats = stats_from_dict(data['stats'])
+        if stats.upper != self.upper:
+            # a different correction range invalidates the stored year counts
+            return
+        if 'fingerprint' not in data['high_water_mark']:
+            # stores written before the multi-line mark cannot be refreshed safely
+            return
+        self.stats = stats
+        self.high_water_mark = data['high_water_mark']
+
+    def save(self):
+        data = {'stats': stats_to_dict(self.stats), 'high_water_mark': self.high_water_mark}
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self.path)
+
+    def rebuild(self, log_path=GIT_LOG_PATH, chunksize=CHUNKSIZE):
+        """Recompute the statistics from the whole log."""
+        self.stats = stream_commit_stats(log_path, chunksize,
+                                         last_commit_timestamp=self.upper)
+        self.high_water_mark = log_mark(log_path)
+        self.save()
+        return self.stats.number_of_commits
+
+    def refresh(self, log_path=GIT_LOG_PATH, chunksize=CHUNKSIZE):
+        """Ingest the commits added since the last refresh.
+
+        Returns the number of new records. If the mark cannot be found the
+        history was rewritten and everything is recomputed.
+        """
+        if self.stats is None:
+            return self.rebuild(log_path, chunksize)
+
+        new_records, new_mark = count_new_records(log_path, self.high_water_mark)
+        if new_records is None:
+            return self.rebuild(log_path, chunksize)
+
+        delta = CommitStats(lower=self.stats.lower, upper=self.stats.upper)
+        if new_records:
+            with read_git_log_chunks(log_path, min(chunksize, new_records)) as chunks:
+                for chunk in chunks:
+                    delta.update(chunk.iloc[:new_records - delta.number_of_commits])
+                    if delta.number_of_commits >= new_records:
+                        break
+            self.stats.merge(delta)
+            self.high_water_mark = new_mark
+            self.save()
+        return delta.number_of_commits
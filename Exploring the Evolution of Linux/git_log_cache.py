@@ -0,0 +1,94 @@
+"""Columnar cache for the parsed ``datasets/git_log.gz``.
+
+The first load parses the log exactly like the notebook and writes it to an
+uncompressed Feather (Arrow IPC) file: ``timestamp`` stays int64 epoch
+seconds and ``author`` is stored dictionary-encoded, which comes back as a
+pandas categorical. The cache remembers the size and mtime of the source
+log (and optionally its SHA-256) in the file metadata. Later loads
+memory-map the Arrow file instead of decompressing and parsing the CSV
+again, and a changed source simply rewrites the cache.
+
+Usage from the notebook directory::
+
+    from git_log_cache import load_git_log
+
+    git_log = load_git_log('datasets/git_log.gz')
+    git_log.head()
+    git_log['author'].value_counts()
+"""
+
+import hashlib
+import json
+import os
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+from git_log_stream import GIT_LOG_COLUMNS, GIT_LOG_PATH
+
+CACHE_METADATA_KEY = b'git_log_source'
+
+
+def default_cache_path(path):
+    base = path[:-3] if path.endswith('.gz') else path
+    return base + '.feather'
+
+
+def source_key(path, use_hash=False):
+    """Identify the current contents of the source log."""
+    stat = os.stat(path)
+    key = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+    if use_hash:
+        sha = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                sha.update(block)
+        key['sha256'] = sha.hexdigest()
+    return key
+
+
+def read_cache_key(cache_path):
+    """Source key stored in an existing cache file, or ``None``."""
+    if not os.path.exists(cache_path):
+        return None
+    try:
+        with pa.memory_map(cache_path) as source:
+            metadata = pa.ipc.open_file(source).schema.metadata or {}
+    except (pa.ArrowInvalid, OSError):
+        return None
+    if CACHE_METADATA_KEY not in metadata:
+        return None
+    return json.loads(metadata[CACHE_METADATA_KEY])
+
+
+def write_git_log_cache(path=GIT_LOG_PATH, cache_path=None, use_hash=False):
+    """Parse ``path`` like the notebook and write the columnar cache."""
+    cache_path = cache_path or default_cache_path(path)
+    git_log = pd.read_csv(path, sep='#', encoding='latin-1', header=None,
+                          names=GIT_LOG_COLUMNS)
+    git_log['author'] = git_log['author'].astype('category')
+
+    table = pa.Table.from_pandas(git_log, preserve_index=False)
+    metadata = dict(table.schema.metadata or {})
+    metadata[CACHE_METADATA_KEY] = json.dumps(source_key(path, use_hash))
+    table = table.replace_schema_metadata(metadata)
+
+    tmp_path = cache_path + '.tmp'
+    # uncompressed, so later reads can map the buffers instead of copying them
+    feather.write_feather(table, tmp_path, compression='uncompressed')
+    os.replace(tmp_path, cache_path)
+    return cache_path
+
+
+def load_git_log(path=GIT_LOG_PATH, cache_path=None, use_hash=False):
+    """Return the parsed log, from the cache when it matches the source.
+
+    ``author`` is a categorical; ``git_log['author'].astype(object)`` gives
+    back the notebook's object column if needed.
+    """
+    cache_path = cache_path or default_cache_path(path)
+    if read_cache_key(cache_path) != source_key(path, use_hash):
+        write_git_log_cache(path, cache_path, use_hash)
+    table = feather.read_table(cache_path, memory_map=True)
+    return table.to_pandas()
@@ -0,0 +1,134 @@
+"""Multi-process ingestion of ``datasets/git_log.gz``.
+
+gzip streams cannot be split, so the log is decompressed once into a plain
+temporary file. That file is cut into byte-range shards that start and end
+on record boundaries, and every worker process parses its shard with the
+same ``read_csv`` settings as the notebook and returns a partial
+:class:`git_log_stream.CommitStats`. The partial author and year counts are
+merged in shard order, which also keeps the first-appearance order of the
+authors, so the result is identical to :func:`git_log_stream.stream_commit_stats`.
+
+Usage from the notebook directory::
+
+    from git_log_parallel import parallel_commit_stats
+
+    stats = parallel_commit_stats('datasets/git_log.gz', processes=64)
+"""
+
+import gzip
+import io
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from git_log_stream import (GIT_LOG_COLUMNS, GIT_LOG_PATH, LAST_COMMIT_TIMESTAMP,
+                            CommitStats, to_epoch_seconds)
+
+SHARDS_PER_PROCESS = 4
+BLOCK_BYTES = 64 << 20
+
+
+def decompress_log(path, directory=None):
+    """Decompress ``path`` into a temporary file and return its name."""
+    fd, plain_path = tempfile.mkstemp(suffix='.log', dir=directory)
+    with os.fdopen(fd, 'wb') as out, gzip.open(path, 'rb') as f:
+        shutil.copyfileobj(f, out, BLOCK_BYTES)
+    return plain_path
+
+
+def last_record_timestamp(plain_path):
+    """Epoch seconds of the last record, read from the end of a plain log."""
+    with open(plain_path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        position = f.tell()
+        tail = b''
+        while position > 0:
+            step = min(1 << 16, position)
+            position -= step
+            f.seek(position)
+            tail = f.read(step) + tail
+            lines = [line for line in tail.split(b'\n') if line.strip()]
+            if len(lines) > 1 or (lines and position == 0):
+                return int(float(lines[-1].split(b'#', 1)[0]))
+    raise ValueError('%s contains no commits' % plain_path)
+
+
+def shard_boundaries(plain_path, shards):
+    """Byte offsets that split the file into ``shards`` whole-record ranges."""
+    size = os.path.getsize(plain_path)
+    offsets = [0]
+    with open(plain_path, 'rb') as f:
+        for i in range(1, shards):
+            position = max(size * i // shards, offsets[-1])
+            if position > 0:
+                # step back one byte so a shard that already starts a line keeps it
+                f.seek(position - 1)
+                f.readline()
+                position = f.tell()
+            offsets.append(min(position, size))
+    offsets.append(size)
+    return [(start, end) for start, end in zip(offsets, offsets[1:]) if end > start]
+
+
+def iter_shard_blocks(plain_path, start, end, block_bytes=BLOCK_BYTES):
+    """Yield the bytes of ``[start, end)`` in blocks cut after a newline."""
+    with open(plain_path, 'rb') as f:
+        f.seek(start)
+        remaining = end - start
+        carry = b''
+        while remaining > 0:
+            data = carry + f.read(min(block_bytes, remaining))
+            remaining = end - f.tell()
+            cut = data.rfind(b'\n') + 1 if remaining > 0 else len(data)
+            if cut == 0:
+                carry = data
+                continue
+            yield data[:cut]
+            carry = data[cut:]
+        if carry:
+            yield carry
+
+
+def shard_stats(plain_path, start, end, lower, upper, block_bytes=BLOCK_BYTES):
+    """Parse and aggregate one byte range of a decompressed log."""
+    stats = CommitStats(lower=lower, upper=upper)
+    for block in iter_shard_blocks(plain_path, start, end, block_bytes):
+        if not block.strip():
+            continue
+        chunk = pd.read_csv(io.BytesIO(block), sep='#', encoding='latin-1',
+                            header=None, names=GIT_LOG_COLUMNS)
+        stats.update(chunk)
+    return stats
+
+
+def parallel_commit_stats(path=GIT_LOG_PATH, processes=None,
+                          first_commit_timestamp=None,
+                          last_commit_timestamp=LAST_COMMIT_TIMESTAMP,
+                          tmp_dir=None):
+    """Compute the notebook's statistics with a pool of worker processes.
+
+    ``path`` may be the gzip log or an already decompressed copy of it.
+    """
+    processes = processes or os.cpu_count() or 1
+    plain_path = decompress_log(path, tmp_dir) if path.endswith('.gz') else path
+    try:
+        if first_commit_timestamp is None:
+            lower = last_record_timestamp(plain_path)
+        else:
+            lower = to_epoch_seconds(first_commit_timestamp)
+        upper = to_epoch_seconds(last_commit_timestamp)
+
+        shards = shard_boundaries(plain_path, processes * SHARDS_PER_PROCESS)
+        stats = CommitStats(lower=lower, upper=upper)
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            futures = [pool.submit(shard_stats, plain_path, start, end, lower, upper)
+                       for start, end in shards]
+            for future in futures:
+                stats.merge(future.result())
+        return stats
+    finally:
+        if plain_path != path:
+            os.remove(plain_path)
@@ -0,0 +1,178 @@
+"""Streaming, bounded-memory commit statistics for ``datasets/git_log.gz``.
+
+The notebook reads the whole log into one DataFrame before it converts the
+timestamps and filters them. That does not work for logs with tens of
+millions of commits, so this module parses the ``timestamp#author`` records
+in fixed-size chunks and folds every chunk into running counters. Only the
+author and year tables are kept in memory, never the log itself.
+
+Usage from the notebook directory::
+
+    from git_log_stream import stream_commit_stats
+
+    stats = stream_commit_stats('datasets/git_log.gz')
+    number_of_authors = stats.number_of_authors
+    top_10_authors = stats.top_authors()
+    commits_per_year = stats.commits_per_year()
+"""
+
+import zlib
+from collections import Counter
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+GIT_LOG_PATH = 'datasets/git_log.gz'
+GIT_LOG_COLUMNS = ['timestamp', 'author']
+CHUNKSIZE = 1_000_000
+LAST_COMMIT_TIMESTAMP = '2018'
+
+
+def read_git_log_chunks(path=GIT_LOG_PATH, chunksize=CHUNKSIZE):
+    """Return an iterator of DataFrames parsed exactly like the notebook does."""
+    return pd.read_csv(path, sep='#', encoding='latin-1', header=None,
+                       names=GIT_LOG_COLUMNS, chunksize=chunksize)
+
+
+def to_epoch_seconds(timestamp):
+    """Convert a timestamp, date string or epoch-second number to epoch seconds."""
+    if isinstance(timestamp, (int, float, np.number)):
+        return int(timestamp)
+    return int(pd.Timestamp(timestamp).value // 10**9)
+
+
+def years_of(seconds):
+    """Calendar year of every epoch-second value in ``seconds``."""
+    seconds = np.asarray(seconds, dtype='int64')
+    return seconds.astype('datetime64[s]').astype('datetime64[Y]').astype('int64') + 1970
+
+
+def find_first_commit_timestamp(path=GIT_LOG_PATH, blocksize=1 << 22):
+    """Epoch seconds of the last record in the log.
+
+    ``git log`` lists the newest commit first, so the notebook takes the last
+    row as the first commit. Decompressing without parsing is much cheaper
+    than the CSV pass, and only the trailing partial line is kept around.
+    """
+    decompressor = zlib.decompressobj(zlib.MAX_WBITS | 32)
+    last_line = b''
+    tail = b''
+    with open(path, 'rb') as f:
+        while True:
+            block = f.read(blocksize)
+            if not block:
+                break
+            data = tail + decompressor.decompress(block)
+            while decompressor.unused_data:
+                # concatenated gzip members
+                rest = decompressor.unused_data
+                decompressor = zlib.decompressobj(zlib.MAX_WBITS | 32)
+                data += decompressor.decompress(rest)
+            lines = data.split(b'\n')
+            tail = lines.pop()
+            for line in reversed(lines):
+                if line.strip():
+                    last_line = line
+                    break
+    data = tail + decompressor.flush()
+    for line in reversed(data.split(b'\n')):
+        if line.strip():
+            last_line = line
+            break
+    if not last_line:
+        raise ValueError('%s contains no commits' % path)
+    return int(float(last_line.split(b'#', 1)[0]))
+
+
+@dataclass
+class CommitStats:
+    """Running author and per-year commit counts.
+
+    ``lower`` and ``upper`` are the inclusive epoch-second bounds of the
+    corrected log (``first_commit_timestamp`` and ``2018`` in the notebook).
+    """
+
+    lower: int
+    upper: int
+    number_of_commits: int = 0
+    author_counts: Counter = field(default_factory=Counter)
+    year_counts: Counter = field(default_factory=Counter)
+    first_year: int = None
+    last_year: int = None
+
+    def update(self, chunk):
+        """Fold one parsed ``timestamp``/``author`` chunk into the counters."""
+        self.number_of_commits += len(chunk)
+        # sort=False keeps first-appearance order, like the full value_counts()
+        self.author_counts.update(chunk['author'].value_counts(sort=False).to_dict())
+
+        timestamps = chunk['timestamp']
+        in_range = (timestamps >= self.lower) & (timestamps <= self.upper)
+        if not in_range.any():
+            return self
+        years = years_of(timestamps[in_range])
+        self.add_year_range(int(years.min()), int(years.max()))
+        has_author = chunk['author'][in_range].notna().to_numpy()
+        self.year_counts.update(pd.Series(years[has_author]).value_counts().to_dict())
+        return self
+
+    def add_year_range(self, first_year, last_year):
+        if self.first_year is None or first_year < self.first_year:
+            self.first_year = first_year
+        if self.last_year is None or last_year > self.last_year:
+            self.last_year = last_year
+
+    def merge(self, other):
+        """Add the counts of ``other`` (collected with the same bounds)."""
+        if (self.lower, self.upper) != (other.lower, other.upper):
+            raise ValueError('cannot merge commit stats with different ranges')
+        self.number_of_commits += other.number_of_commits
+        self.author_counts.update(other.author_counts)
+        self.year_counts.update(other.year_counts)
+        if other.first_year is not None:
+            self.add_year_range(other.first_year, other.last_year)
+        return self
+
+    @property
+    def number_of_authors(self):
+        return len(self.author_counts)
+
+    def top_authors(self, n=5):
+        """Equivalent of ``git_log['author'].value_counts().head(n)``."""
+        top = pd.Series(dict(self.author_counts.most_common(n)), name='count', dtype='int64')
+        top.index.name = 'author'
+        return top
+
+    def commits_per_year(self):
+        """Equivalent of the notebook's yearly ``pd.Grouper`` count."""
+        if self.first_year is None:
+            years = np.array([], dtype='int64')
+        else:
+            years = np.arange(self.first_year, self.last_year + 1)
+        year_starts = (years - 1970).astype('datetime64[Y]').astype('datetime64[s]')
+        # same unit='s' conversion as the notebook, so the index dtypes agree
+        index = pd.DatetimeIndex(pd.to_datetime(year_starts.astype('int64'), unit='s'),
+                                 name='timestamp')
+        if len(index):
+            index.freq = 'YS'
+        counts = [self.year_counts.get(year, 0) for year in years]
+        return pd.DataFrame({'author': np.array(counts, dtype='int64')}, index=index)
+
+
+def stream_commit_stats(path=GIT_LOG_PATH, chunksize=CHUNKSIZE,
+                        first_commit_timestamp=None,
+                        last_commit_timestamp=LAST_COMMIT_TIMESTAMP):
+    """Compute the notebook's statistics over ``path`` in bounded memory.
+
+    When ``first_commit_timestamp`` is not given it is read from the last
+    record of the log, which costs one extra decompression pass.
+    """
+    if first_commit_timestamp is None:
+        lower = find_first_commit_timestamp(path)
+    else:
+        lower = to_epoch_seconds(first_commit_timestamp)
+    stats = CommitStats(lower=lower, upper=to_epoch_seconds(last_commit_timestamp))
+    for chunk in read_git_log_chunks(path, chunksize):
+        stats.update(chunk)
+    return stats
@@ -0,0 +1,65 @@
+"""Concurrent loading and cleaning of the three Airbnb sources.
+
+The notebook reads ``airbnb_price.csv``, ``airbnb_room_type.xlsx`` and
+``airbnb_last_review.tsv`` one after another although they do not depend on
+each other. :func:`load_airbnb` reads and cleans all three at once in a
+thread pool (pyarrow's CSV reader and the Feather sidecar release the GIL)
+or, for sources that spend their time in Python code, a process pool, so the
+wall-clock time approaches that of the slowest file.
+
+Usage from the notebook directory::
+
+    from airbnb_loaders import load_airbnb
+
+    prices, room_types, reviews = load_airbnb()
+"""
+
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pandas as pd
+
+import room_type_cache
+from airbnb_schema import apply_schema
+from price_parsing import PRICES_PATH, read_prices
+from review_dates import parse_review_dates
+
+ROOM_TYPES_PATH = room_type_cache.ROOM_TYPES_PATH
+REVIEWS_PATH = "datasets/airbnb_last_review.tsv"
+EXECUTORS = {"thread": ThreadPoolExecutor, "process": ProcessPoolExecutor}
+
+
+def load_prices(path=PRICES_PATH):
+    """``airbnb_price.csv`` with a numeric ``price`` column."""
+    return read_prices(path)
+
+
+def load_room_types(path=ROOM_TYPES_PATH):
+    """``airbnb_room_type.xlsx`` with lower-cased, categorical room types."""
+    room_types = room_type_cache.load_room_types(path)
+    room_types["room_type"] = room_types["room_type"].str.lower().astype("category")
+    return room_types
+
+
+def load_reviews(path=REVIEWS_PATH):
+    """``airbnb_last_review.tsv`` with ``last_review`` parsed as datetimes."""
+    reviews = pd.read_csv(path, sep="\t")
+    reviews["last_review"], _, _ = parse_review_dates(reviews["last_review"])
+    return reviews
+
+
+def load_airbnb(prices_path=PRICES_PATH, room_types_path=ROOM_TYPES_PATH,
+                reviews_path=REVIEWS_PATH, executor="thread", compact=False):
+    """Load and clean the three sources concurrently.
+
+    Returns ``(prices, room_types, reviews)`` ready to merge on
+    ``listing_id``. ``executor`` is ``"thread"`` or ``"process"``; with
+    ``compact=True`` every frame gets the :mod:`airbnb_schema` dtypes.
+    """
+    with EXECUTORS[executor](max_workers=3) as pool:
+        prices = pool.submit(load_prices, prices_path)
+        room_types = pool.submit(load_room_types, room_types_path)
+        reviews = pool.submit(load_reviews, reviews_path)
+        frames = prices.result(), room_types.result(), reviews.result()
+    if compact:
+        frames = tuple(apply_schema(frame) for frame in frames)
+    return frames
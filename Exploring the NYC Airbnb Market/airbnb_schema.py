@@ -0,0 +1,91 @@
+"""Memory-compact dtypes for the Airbnb frames.
+
+After the merges the notebook's ``airbnb_merged`` stores every text column
+as Python string objects and ``price`` as float64. :data:`AIRBNB_SCHEMA`
+declares a compact type per column: categoricals for the low-cardinality
+``borough``, ``nbhood_full`` and ``room_type``, Arrow-backed strings for
+free text, the narrowest integer type that holds ``listing_id``, and a
+signed integer of at least 32 bits for whole-dollar ``price``, which the
+notebook multiplies by 365 (prices with cents stay float64, since float32
+would round them).
+:func:`apply_schema` applies it to whichever of those columns a frame has,
+so it works on each source at ingest as well as on the merged frame, and
+:func:`memory_report` shows what it saved.
+
+Usage from the notebook directory::
+
+    from airbnb_schema import apply_schema, memory_report
+
+    compact = apply_schema(airbnb_merged)
+    print(memory_report(airbnb_merged, compact))
+"""
+
+import numpy as np
+import pandas as pd
+
+NARROWEST_INTEGER = "integer"
+# signed and at least int32, so arithmetic on the column does not wrap
+ARITHMETIC_INTEGER = "arithmetic integer"
+AIRBNB_SCHEMA = {
+    "listing_id": NARROWEST_INTEGER,
+    "price": ARITHMETIC_INTEGER,
+    "nbhood_full": "category",
+    "borough": "category",
+    "room_type": "category",
+    "description": "string[pyarrow]",
+    "host_name": "string[pyarrow]",
+}
+
+
+def narrowest_integer(column, minimum=None):
+    """Smallest (preferably unsigned) integer dtype for a whole-number column.
+
+    With a ``minimum`` dtype such as ``"int32"`` the result is signed and at
+    least that wide. Columns with missing or fractional values are returned
+    unchanged.
+
+    ``price`` gets ``int32``, so the notebook's ``price * 365 / 12`` does
+    not wrap around the way it would in ``uint16``:
+
+    >>> prices = apply_schema(pd.DataFrame({"listing_id": [2595], "price": [7500]}))
+    >>> prices.dtypes.astype(str).tolist()
+    ['uint16', 'int32']
+    >>> float((prices["price"] * 365 / 12).iloc[0])
+    228125.0
+    """
+    values = column.to_numpy()
+    if column.isna().any() or (values.dtype.kind == "f" and not np.equal(np.mod(values, 1), 0).all()):
+        return column
+    if minimum is not None:
+        column = pd.to_numeric(column.astype("int64"), downcast="integer")
+        return column.astype(np.promote_types(column.dtype, minimum))
+    downcast = "unsigned" if len(column) == 0 or column.min() >= 0 else "integer"
+    return pd.to_numeric(column.astype("int64"), downcast=downcast)
+
+
+def apply_schema(frame, schema=AIRBNB_SCHEMA):
+    """Return a copy of ``frame`` with the schema's dtypes on matching columns."""
+    frame = frame.copy()
+    for column, dtype in schema.items():
+        if column not in frame:
+            continue
+        if dtype == NARROWEST_INTEGER:
+            frame[column] = narrowest_integer(frame[column])
+        elif dtype == ARITHMETIC_INTEGER:
+            frame[column] = narrowest_integer(frame[column], minimum="int32")
+        else:
+            frame[column] = frame[column].astype(dtype)
+    return frame
+
+
+def memory_report(before, after):
+    """Deep memory usage per column before and after, in bytes."""
+    report = pd.DataFrame({
+        "before": before.memory_usage(deep=True, index=False),
+        "after": after.memory_usage(deep=True, index=False),
+    })
+    report.loc["total"] = report.sum()
+    report["dtype_before"] = before.dtypes.astype(str)
+    report["dtype_after"] = after.dtypes.astype(str)
+    report["saved"] = 1 - report["after"] / report["before"]
+    return report
@@ -0,0 +1,180 @@
+"""Incrementally maintained price statistics per borough.
+
+The notebook recomputes
+``airbnb_merged.groupby("borough")["price"].agg(["sum", "mean", "median", "count"])``
+over the whole merged frame. When listing prices change continuously it is
+cheaper to keep the per-borough state and apply each change to it:
+``sum`` and ``count`` (and therefore ``mean``) are updated exactly, and the
+median comes from a sorted multiset of the borough's prices, stored as
+small sorted blocks so an insert or delete moves at most one block.
+
+Usage from the notebook directory::
+
+    from borough_aggregates import BoroughPriceAggregates
+
+    aggregates = BoroughPriceAggregates.from_frame(airbnb_merged)
+    aggregates.update(2595, price=240)
+    aggregates.delete(3831)
+    aggregates.insert(99999, "Queens, Astoria", 80)
+    boroughs = aggregates.table()
+"""
+
+from bisect import bisect_left, bisect_right, insort
+
+import pandas as pd
+
+BLOCK_SIZE = 512
+
+
+def borough_of(nbhood_full):
+    """Borough part of ``"Brooklyn, Clinton Hill"``, like ``str.partition(",")[0]``."""
+    return nbhood_full.partition(",")[0]
+
+
+class SortedMultiset:
+    """Sorted values kept in blocks of at most ``2 * BLOCK_SIZE`` items."""
+
+    def __init__(self, values=()):
+        values = sorted(values)
+        self.blocks = [values[i:i + BLOCK_SIZE] for i in range(0, len(values), BLOCK_SIZE)]
+        self.size = len(values)
+
+    def __len__(self):
+        return self.size
+
+    def find_block(self, value):
+        # first block whose last item is >= value
+        lo, hi = 0, len(self.blocks)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.blocks[mid][-1] < value:
+                lo = mid + 1
+            else:
+                hi = mid
+        return min(lo, len(self.blocks) - 1)
+
+    def add(self, value):
+        if not self.blocks:
+            self.blocks.append([value])
+        else:
+            i = self.find_block(value)
+            block = self.blocks[i]
+            insort(block, value)
+            if len(block) > 2 * BLOCK_SIZE:
+                self.blocks[i:i + 1] = [block[:BLOCK_SIZE], block[BLOCK_SIZE:]]
+        self.size += 1
+
+    def remove(self, value):
+        if self.blocks:
+            i = self.find_block(value)
+            block = self.blocks[i]
+            j = bisect_left(block, value)
+            if j < len(block) and block[j] == value:
+                del block[j]
+                if not block:
+                    del self.blocks[i]
+                self.size -= 1
+                return
+        raise KeyError(value)
+
+    def count_less_equal(self, value):
+        total = 0
+        for block in self.blocks:
+            if block[-1] <= value:
+                total += len(block)
+            else:
+                return total + bisect_right(block, value)
+        return total
+
+    def __getitem__(self, k):
+        if not 0 <= k < self.size:
+            raise IndexError(k)
+        for block in self.blocks:
+            if k < len(block):
+                return block[k]
+            k -= len(block)
+
+    def median(self):
+        if not self.size:
+            return float("nan")
+        middle = self.size // 2
+        if self.size % 2:
+            return self[middle]
+        return (self[middle - 1] + self[middle]) / 2
+
+
+class BoroughStats:
+    """Exact running statistics of one borough's prices."""
+
+    def __init__(self):
+        self.sum = 0
+        self.count = 0
+        self.prices = SortedMultiset()
+
+    def add(self, price):
+        self.sum += price
+        self.count += 1
+        self.prices.add(price)
+
+    def remove(self, price):
+        self.prices.remove(price)
+        self.sum -= price
+        self.count -= 1
+
+    @property
+    def mean(self):
+        return self.sum / self.count if self.count else float("nan")
+
+
+class BoroughPriceAggregates:
+    """Per-borough ``sum``/``mean``/``median``/``count`` under listing changes."""
+
+    def __init__(self):
+        self.listings = {}
+        self.boroughs = {}
+
+    @classmethod
+    def from_frame(cls, airbnb_merged):
+        """Start from a merged frame with ``listing_id``, ``nbhood_full`` and ``price``."""
+        aggregates = cls()
+        frame = airbnb_merged[["listing_id", "nbhood_full", "price"]]
+        for listing_id, nbhood_full, price in frame.itertuples(index=False):
+            aggregates.insert(listing_id, nbhood_full, price)
+        return aggregates
+
+    def insert(self, listing_id, nbhood_full, price):
+        if listing_id in self.listings:
+            raise KeyError("listing {} already exists".format(listing_id))
+        borough = borough_of(nbhood_full)
+        self.listings[listing_id] = (borough, price)
+        self.boroughs.setdefault(borough, BoroughStats()).add(price)
+
+    def delete(self, listing_id):
+        borough, price = self.listings.pop(listing_id)
+        stats = self.boroughs[borough]
+        stats.remove(price)
+        if not stats.count:
+            del self.boroughs[borough]
+
+    def update(self, listing_id, price=None, nbhood_full=None):
+        """Change a listing's price and/or neighbourhood."""
+        borough, old_price = self.listings[listing_id]
+        if nbhood_full is None and price is None:
+            return
+        self.delete(listing_id)
+        new_nbhood = nbhood_full if nbhood_full is not None else borough
+        self.insert(listing_id, new_nbhood, old_price if price is None else price)
+
+    def upsert(self, listing_id, nbhood_full, price):
+        if listing_id in self.listings:
+            self.delete(listing_id)
+        self.insert(listing_id, nbhood_full, price)
+
+    def table(self):
+        """The notebook's ``boroughs`` table, rounded and sorted by mean."""
+        boroughs = pd.DataFrame(
+            [(stats.sum, stats.mean, stats.prices.median(), stats.count)
+             for stats in self.boroughs.values()],
+            index=pd.Index(list(self.boroughs), name="borough"),
+            columns=["sum", "mean", "median", "count"])
+        return boroughs.round(2).sort_values("mean", ascending=False)
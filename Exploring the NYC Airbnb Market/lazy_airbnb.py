@@ -0,0 +1,217 @@
+"""Lazy query-plan mode for the Airbnb analysis.
+
+Every notebook cell materializes a complete frame, although the final
+``boroughs`` and ``prices_by_borough`` tables only use ``price`` and the
+borough part of ``nbhood_full``. :class:`LazyAirbnb` records the notebook's
+steps (read, clean prices, filter free listings, merge, borough partition,
+aggregate) without running them. :meth:`LazyAirbnb.collect` then plans the
+work backwards from the requested outputs:
+
+* column projection is pushed into the CSV readers: the columns an output
+  needs are parsed with their types and converted to pandas, every other
+  column is only parsed as plain strings (no type inference or date
+  parsing) and never leaves Arrow;
+* the ``price == 0`` filter runs on the Arrow table right after the prices
+  are parsed, before anything else is built;
+* the notebook's ``dropna()`` after the merge is pushed into the readers
+  too: the null masks of all columns, projected or not, drop the
+  incomplete rows before the join, which gives the same rows.
+
+``price`` comes back as float64, like the notebook's, where the outer
+merge has introduced missing values before ``dropna()``.
+
+:meth:`LazyAirbnb.explain` prints the resulting plan.
+
+Usage from the notebook directory::
+
+    from lazy_airbnb import LazyAirbnb
+
+    plan = (LazyAirbnb().clean_prices().filter_free_listings()
+            .merge().borough().aggregate())
+    print(plan.explain())
+    results = plan.collect()
+    boroughs, prices_by_borough = results["boroughs"], results["prices_by_borough"]
+"""
+
+import csv
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
+
+import room_type_cache
+from airbnb_loaders import REVIEWS_PATH, ROOM_TYPES_PATH
+from listing_join import KEY, join_listings
+from price_cube import PRICE_RANGE_EDGES, PriceCube
+from price_parsing import PRICES_PATH, parse_prices
+from review_dates import parse_review_dates
+
+STEPS = ["read", "clean_prices", "filter_free_listings", "merge", "borough", "aggregate"]
+OPTIONAL_STEPS = {"filter_free_listings"}
+# columns each output needs, besides the join key
+OUTPUT_COLUMNS = {
+    "boroughs": {"price", "nbhood_full"},
+    "prices_by_borough": {"price", "nbhood_full"},
+    "airbnb_merged": None,  # every column
+}
+# the step an output needs to have been recorded
+OUTPUT_STEPS = {"boroughs": "aggregate", "prices_by_borough": "aggregate", "airbnb_merged": "merge"}
+DEFAULT_OUTPUTS = ("boroughs", "prices_by_borough")
+# read empty and "NA"-like strings as missing, as pd.read_csv does
+CSV_NULLS = dict(strings_can_be_null=True)
+
+
+class LazyAirbnb:
+    """An immutable recording of the notebook's steps, run by :meth:`collect`."""
+
+    def __init__(self, prices_path=PRICES_PATH, room_types_path=ROOM_TYPES_PATH,
+                 reviews_path=REVIEWS_PATH, steps=None):
+        self.paths = {"prices": prices_path, "room_types": room_types_path,
+                      "reviews": reviews_path}
+        self.steps = steps or {"read": {}}
+
+    def then(self, step, **options):
+        last = STEPS.index(list(self.steps)[-1])
+        position = STEPS.index(step)
+        if position <= last or set(STEPS[last + 1:position]) - OPTIONAL_STEPS:
+            raise ValueError("cannot add step {!r} after {!r}".format(step, STEPS[last]))
+        steps = dict(self.steps)
+        steps[step] = options
+        return LazyAirbnb(self.paths["prices"], self.paths["room_types"],
+                          self.paths["reviews"], steps)
+
+    def clean_prices(self):
+        return self.then("clean_prices")
+
+    def filter_free_listings(self):
+        return self.then("filter_free_listings")
+
+    def merge(self):
+        return self.then("merge")
+
+    def borough(self):
+        return self.then("borough")
+
+    def aggregate(self, edges=PRICE_RANGE_EDGES, labels=None):
+        return self.then("aggregate", edges=edges, labels=labels)
+
+    def plan(self, outputs=DEFAULT_OUTPUTS):
+        """Columns to materialize per source and the filters pushed into them."""
+        for output in outputs:
+            if OUTPUT_STEPS[output] not in self.steps:
+                raise ValueError("{!r} needs the {!r} step".format(output, OUTPUT_STEPS[output]))
+        if "aggregate" in self.steps and "clean_prices" not in self.steps:
+            raise ValueError("aggregating needs the clean_prices step")
+        needed = set()
+        for output in outputs:
+            if OUTPUT_COLUMNS[output] is None:
+                needed = None
+                break
+            needed |= OUTPUT_COLUMNS[output]
+        return {
+            "columns": needed,
+            "drop_free_listings": "filter_free_listings" in self.steps,
+            "clean_prices": "clean_prices" in self.steps,
+        }
+
+    def explain(self, outputs=DEFAULT_OUTPUTS):
+        plan = self.plan(outputs)
+        projection = "all columns" if plan["columns"] is None else \
+            ", ".join(sorted(plan["columns"] | {KEY}))
+        lines = ["steps: " + " -> ".join(self.steps),
+                 "outputs: " + ", ".join(outputs),
+                 "materialized columns: " + projection,
+                 "other columns: parsed as strings for the pushed-down dropna() null masks,"
+                 " not converted to pandas"]
+        if plan["drop_free_listings"]:
+            lines.append("prices reader: parse price, then filter price != 0")
+        return "\n".join(lines)
+
+    def collect(self, outputs=DEFAULT_OUTPUTS):
+        """Run the plan and return ``{output name: frame}``."""
+        plan = self.plan(outputs)
+        prices = read_prices_projected(self.paths["prices"], plan)
+        room_types = read_room_types_projected(self.paths["room_types"], plan["columns"])
+        reviews = read_reviews_projected(self.paths["reviews"], plan["columns"])
+
+        airbnb_merged, _ = join_listings(prices, room_types, reviews)
+        if "price" in airbnb_merged:
+            # float64 like the notebook's, where the outer merge added NaNs
+            airbnb_merged["price"] = airbnb_merged["price"].astype("float64")
+        results = {}
+        if "airbnb_merged" in outputs:
+            results["airbnb_merged"] = airbnb_merged
+        if "borough" in self.steps:
+            airbnb_merged["borough"] = airbnb_merged["nbhood_full"].str.partition(",")[0]
+        if "boroughs" in outputs:
+            boroughs = airbnb_merged.groupby("borough")["price"].agg(["sum", "mean", "median", "count"])
+            results["boroughs"] = boroughs.round(2).sort_values("mean", ascending=False)
+        if "prices_by_borough" in outputs:
+            options = self.steps["aggregate"]
+            results["prices_by_borough"] = PriceCube.from_frame(airbnb_merged).prices_by_borough(
+                options["edges"], options["labels"])
+        return results
+
+
+def project(table, columns):
+    """Drop incomplete rows, then keep the key and the wanted columns.
+
+    Every column is checked for nulls, like ``dropna()`` on the merged
+    frame, but only the projected ones are converted to pandas later.
+    """
+    complete = None
+    for name in table.column_names:
+        valid = pc.is_valid(table.column(name))
+        complete = valid if complete is None else pc.and_(complete, valid)
+    if complete is not None and table.num_rows and not pc.all(complete).as_py():
+        table = table.filter(complete)
+    if columns is not None:
+        table = table.select([name for name in table.column_names
+                              if name == KEY or name in columns])
+    return table
+
+
+def csv_column_names(path, delimiter=","):
+    with open(path, newline="") as f:
+        return next(csv.reader(f, delimiter=delimiter))
+
+
+def convert_options(path, columns, delimiter=",", column_types=None):
+    """Typed parsing for the projected columns, plain strings for the others."""
+    types = dict(column_types or {})
+    if columns is not None:
+        types.update({name: pa.string() for name in csv_column_names(path, delimiter)
+                      if name != KEY and name not in columns})
+    return pa_csv.ConvertOptions(column_types=types, **CSV_NULLS)
+
+
+def read_prices_projected(path, plan):
+    columns = plan["columns"]
+    if columns is not None and plan["clean_prices"]:
+        columns = columns | {"price"}
+    table = pa_csv.read_csv(path, convert_options=convert_options(path, columns))
+    if plan["clean_prices"]:
+        price = pa.array(parse_prices(table.column("price")), from_pandas=True)
+        table = table.set_column(table.column_names.index("price"), "price", price)
+        if plan["drop_free_listings"]:
+            table = table.filter(pc.not_equal(table.column("price"), 0))
+    return project(table, plan["columns"]).to_pandas()
+
+
+def read_room_types_projected(path, columns):
+    # the sidecar is memory-mapped, so its null masks cost no parsing
+    table = project(room_type_cache.read_room_type_table(path), columns)
+    room_types = table.to_pandas()
+    if "room_type" in room_types:
+        room_types["room_type"] = room_types["room_type"].str.lower().astype("category")
+    return room_types
+
+
+def read_reviews_projected(path, columns):
+    table = pa_csv.read_csv(path, parse_options=pa_csv.ParseOptions(delimiter="\t"),
+                            convert_options=convert_options(
+                                path, columns, "\t", {"last_review": pa.string()}))
+    reviews = project(table, columns).to_pandas()
+    if "last_review" in reviews:
+        reviews["last_review"], _, _ = parse_review_dates(reviews["last_review"])
+    return reviews
@@ -0,0 +1,105 @@
+"""Single-pass inner join of the Airbnb sources on ``listing_id``.
+
+The notebook builds ``airbnb_merged`` with two outer merges, drops every row
+with a missing value and then counts duplicated rows. The outer merges
+materialize every listing of every file even though ``dropna()`` throws
+away the ones that are not in all three. :func:`join_listings` sorts the
+keys of each input once, intersects the sorted unique keys and gathers only
+the matching rows of each frame, so no outer-join intermediate is built.
+Unmatched and repeated keys are counted along the way.
+
+The rows are the ones the notebook keeps, in ``listing_id`` order, with a
+fresh index. Columns that never passed through an outer join keep their
+dtype, e.g. ``price`` stays int64 instead of becoming float64.
+
+Usage from the notebook directory::
+
+    from airbnb_loaders import load_airbnb
+    from listing_join import join_listings
+
+    airbnb_merged, report = join_listings(*load_airbnb())
+    print(report)
+"""
+
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+KEY = "listing_id"
+
+
+@dataclass
+class JoinReport:
+    """What the join matched, expanded and dropped."""
+
+    rows: dict = field(default_factory=dict)
+    unmatched_keys: dict = field(default_factory=dict)
+    duplicate_keys: dict = field(default_factory=dict)
+    matched_keys: int = 0
+    dropped_missing: int = 0
+    duplicated_rows: int = 0
+
+    def __str__(self):
+        lines = ["Joined {} listings.".format(self.matched_keys)]
+        for name, rows in self.rows.items():
+            lines.append("  {}: {} rows, {} unmatched keys, {} duplicate keys".format(
+                name, rows, self.unmatched_keys[name], self.duplicate_keys[name]))
+        lines.append("Dropped {} rows with missing values.".format(self.dropped_missing))
+        lines.append("There are {} duplicates in the DataFrame.".format(self.duplicated_rows))
+        return "\n".join(lines)
+
+
+def sorted_key_groups(keys):
+    """Sort order, unique keys, first sorted position and size of each key."""
+    order = np.argsort(keys, kind="stable")
+    unique, starts, counts = np.unique(keys[order], return_index=True, return_counts=True)
+    return order, unique, starts, counts
+
+
+def join_listings(prices, room_types, reviews, key=KEY, names=("prices", "room_types", "reviews")):
+    """Inner-join the three frames on ``key`` and drop rows with missing values.
+
+    Returns ``(airbnb_merged, report)``. Keys repeated in several inputs
+    produce every combination, exactly like ``merge`` does.
+    """
+    frames = [prices, room_types, reviews]
+    report = JoinReport()
+    groups = [sorted_key_groups(frame[key].to_numpy()) for frame in frames]
+
+    common = groups[0][1]
+    for _, unique, _, _ in groups[1:]:
+        common = np.intersect1d(common, unique, assume_unique=True)
+    report.matched_keys = len(common)
+
+    sizes, firsts = [], []
+    for name, frame, (order, unique, starts, counts) in zip(names, frames, groups):
+        at = np.searchsorted(unique, common)
+        sizes.append(counts[at])
+        firsts.append(starts[at])
+        report.rows[name] = len(frame)
+        report.unmatched_keys[name] = len(unique) - len(common)
+        report.duplicate_keys[name] = int((counts > 1).sum())
+
+    # rows per key is the product of its group sizes; ``stride`` walks the
+    # combinations the way nested loops over the three groups would
+    per_key = np.prod(sizes, axis=0) if len(common) else np.zeros(0, dtype="int64")
+    key_of_row = np.repeat(np.arange(len(common)), per_key)
+    rank = np.arange(len(key_of_row)) - np.repeat(np.cumsum(per_key) - per_key, per_key)
+    stride = np.ones(len(common), dtype="int64")
+    columns = []
+    for i in reversed(range(len(frames))):
+        frame, (order, _, _, _) = frames[i], groups[i]
+        within = (rank // stride[key_of_row]) % sizes[i][key_of_row]
+        rows = order[firsts[i][key_of_row] + within]
+        part = frame.iloc[rows].reset_index(drop=True)
+        columns.append(part if i == 0 else part.drop(columns=key))
+        stride = stride * sizes[i]
+    airbnb_merged = pd.concat(columns[::-1], axis=1)
+
+    complete = airbnb_merged.notna().all(axis=1)
+    report.dropped_missing = int((~complete).sum())
+    if report.dropped_missing:
+        airbnb_merged = airbnb_merged[complete].reset_index(drop=True)
+    report.duplicated_rows = int(airbnb_merged.duplicated().sum())
+    return airbnb_merged, report
@@ -0,0 +1,139 @@
+"""Run the Airbnb pipeline over many cities and snapshots in parallel.
+
+Every shard is one city snapshot with its own price, room type and review
+files. A worker process runs the notebook's steps on its shard (clean the
+three sources, drop free listings, join on ``listing_id``, split the
+borough off ``nbhood_full``) and returns partial aggregates per group:
+price sum and count, a :class:`quantile_sketch.QuantileSketch` for the
+median, and the price-range counts of :class:`price_cube.PriceCube`. The
+driver merges the partials, so sums and counts are exact and medians are
+within the sketch's relative accuracy, and emits one combined table.
+
+Shards can be listed by hand or discovered from a directory tree laid out
+as ``<root>/<city>/<snapshot>/`` holding the three dataset files.
+
+Usage from the notebook directory::
+
+    from multi_city import discover_shards, run_shards
+
+    table = run_shards(discover_shards("snapshots"), group_by=("city", "borough"))
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
+
+import pandas as pd
+
+from airbnb_loaders import load_airbnb
+from listing_join import join_listings
+from price_cube import PRICE_RANGE_EDGES, PriceCube, bin_labels, check_edges
+from quantile_sketch import RELATIVE_ACCURACY, QuantileSketch
+
+PRICES_FILE = "airbnb_price.csv"
+ROOM_TYPES_FILE = "airbnb_room_type.xlsx"
+REVIEWS_FILE = "airbnb_last_review.tsv"
+GROUP_KEYS = ("city", "snapshot", "borough")
+
+
+@dataclass(frozen=True)
+class Shard:
+    """One city snapshot and its three source files."""
+
+    city: str
+    snapshot: str
+    prices_path: str
+    room_types_path: str
+    reviews_path: str
+
+
+@dataclass
+class GroupAggregate:
+    """Mergeable price statistics of one group of listings."""
+
+    sum: float = 0
+    count: int = 0
+    sketch: QuantileSketch = field(default_factory=QuantileSketch)
+    price_ranges: pd.Series = None
+
+    def merge(self, other):
+        self.sum += other.sum
+        self.count += other.count
+        self.sketch.merge(other.sketch)
+        if self.price_ranges is None:
+            self.price_ranges = other.price_ranges
+        elif other.price_ranges is not None:
+            self.price_ranges = self.price_ranges.add(other.price_ranges, fill_value=0)
+        return self
+
+
+def discover_shards(root):
+    """Shards for every ``<root>/<city>/<snapshot>/`` with all three files."""
+    shards = []
+    for city in sorted(os.listdir(root)):
+        city_dir = os.path.join(root, city)
+        if not os.path.isdir(city_dir):
+            continue
+        for snapshot in sorted(os.listdir(city_dir)):
+            paths = [os.path.join(city_dir, snapshot, name)
+                     for name in (PRICES_FILE, ROOM_TYPES_FILE, REVIEWS_FILE)]
+            if all(os.path.exists(path) for path in paths):
+                shards.append(Shard(city, snapshot, *paths))
+    return shards
+
+
+def aggregate_shard(shard, group_by=GROUP_KEYS, edges=PRICE_RANGE_EDGES,
+                    labels=None, alpha=RELATIVE_ACCURACY):
+    """Run the notebook's pipeline on one shard; return partials per group."""
+    prices, room_types, reviews = load_airbnb(shard.prices_path, shard.room_types_path,
+                                              shard.reviews_path)
+    prices = prices.loc[prices["price"] != 0]
+    airbnb_merged, _ = join_listings(prices, room_types, reviews)
+    airbnb_merged["borough"] = airbnb_merged["nbhood_full"].str.partition(",")[0]
+    airbnb_merged["city"] = shard.city
+    airbnb_merged["snapshot"] = shard.snapshot
+
+    partials = {}
+    for key, group in airbnb_merged.groupby(list(group_by), sort=False):
+        counts, _ = PriceCube.from_frame(group).bin(edges, labels)
+        partials[key] = GroupAggregate(
+            sum=group["price"].sum(),
+            count=len(group),
+            sketch=QuantileSketch(alpha).add(group["price"].to_numpy()),
+            price_ranges=counts.sum().astype("int64"),
+        )
+    return partials
+
+
+def run_shards(shards, group_by=("city", "borough"), processes=None,
+               edges=PRICE_RANGE_EDGES, labels=None, alpha=RELATIVE_ACCURACY):
+    """Aggregate all shards in a process pool and return one combined table.
+
+    ``group_by`` is any subset of ``("city", "snapshot", "borough")``. The
+    table has ``sum``, ``mean``, ``median`` and ``count`` per group, like the
+    notebook's ``boroughs``, followed by one count column per price range.
+    """
+    group_by = tuple(group_by)
+    labels = bin_labels(check_edges(edges), labels)
+    merged = {}
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        work = partial(aggregate_shard, group_by=group_by, edges=edges, labels=labels,
+                       alpha=alpha)
+        for shard_partials in pool.map(work, shards):
+            for key, aggregate in shard_partials.items():
+                if key in merged:
+                    merged[key].merge(aggregate)
+                else:
+                    merged[key] = aggregate
+
+    rows = []
+    for key, aggregate in merged.items():
+        row = dict(zip(group_by, key))
+        row.update({"sum": aggregate.sum, "mean": aggregate.sum / aggregate.count,
+                    "median": aggregate.sketch.median(), "count": aggregate.count})
+        row.update(aggregate.price_ranges.to_dict())
+        rows.append(row)
+    columns = list(group_by) + ["sum", "mean", "median", "count"] + list(labels)
+    table = pd.DataFrame(rows, columns=columns).set_index(list(group_by)).sort_index()
+    return table.round(2)
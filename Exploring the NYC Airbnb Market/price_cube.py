@@ -0,0 +1,137 @@
+"""Borough x price-range cube with cheap re-binning.
+
+The notebook labels every listing with ``pd.cut`` and then counts the
+labels with a separate ``groupby(["borough", "price_range"])``. Pricing
+analysts re-bin many times per session, so :class:`PriceCube` sorts the
+prices of each borough once and keeps their prefix sums. Any set of bin
+edges is then answered with one ``searchsorted`` per borough: counts are
+differences of positions and sums are differences of prefix sums, without
+touching the listing rows again.
+
+Bins are right-closed like ``pd.cut``: a price ``p`` falls in bin ``i``
+when ``edges[i] < p <= edges[i + 1]``, so free listings (price 0) are not
+counted with the default edges.
+
+Usage from the notebook directory::
+
+    from price_cube import PriceCube
+
+    cube = PriceCube.from_frame(airbnb_merged)
+    prices_by_borough = cube.prices_by_borough()
+    counts, sums = cube.bin([0, 100, 200, 500, np.inf])
+"""
+
+import numpy as np
+import pandas as pd
+
+from borough_aggregates import borough_of
+
+PRICE_RANGE_LABELS = ["Budget", "Average", "Expensive", "Extravagant"]
+PRICE_RANGE_EDGES = [0, 69, 175, 350, np.inf]
+
+
+def check_edges(edges):
+    """``edges`` as a float array; like ``pd.cut``, they must strictly increase.
+
+    >>> check_edges([0, 100, 100, np.inf])
+    Traceback (most recent call last):
+    ValueError: bins must increase monotonically
+    """
+    edges = np.asarray(edges, dtype="float64")
+    if edges.ndim != 1 or len(edges) < 2 or not (np.diff(edges) > 0).all():
+        raise ValueError("bins must increase monotonically")
+    return edges
+
+
+def bin_labels(edges, labels=None):
+    """``labels`` checked against ``edges``, or generated ``"(lo, hi]"`` labels.
+
+    The notebook's names are only used for the notebook's edges, not for
+    any other set of five edges:
+
+    >>> bin_labels(check_edges(PRICE_RANGE_EDGES))
+    ['Budget', 'Average', 'Expensive', 'Extravagant']
+    >>> bin_labels(check_edges([0, 100, 200, 500, np.inf]))
+    ['(0.0, 100.0]', '(100.0, 200.0]', '(200.0, 500.0]', '(500.0, inf]']
+    >>> bin_labels(check_edges([0, 100, np.inf]), ["cheap"])
+    Traceback (most recent call last):
+    ValueError: Bin labels must be one fewer than the number of bin edges
+    """
+    if labels is None:
+        if np.array_equal(edges, PRICE_RANGE_EDGES):
+            return PRICE_RANGE_LABELS
+        return ["({}, {}]".format(lo, hi) for lo, hi in zip(edges[:-1], edges[1:])]
+    if len(labels) != len(edges) - 1:
+        raise ValueError("Bin labels must be one fewer than the number of bin edges")
+    return list(labels)
+
+
+def bin_codes(prices, edges=PRICE_RANGE_EDGES):
+    """Bin index of every price, -1 outside the edges (like ``pd.cut`` NaN)."""
+    edges = check_edges(edges)
+    codes = np.searchsorted(edges, prices, side="left") - 1
+    codes[(codes < 0) | (codes >= len(edges) - 1) | np.isnan(prices)] = -1
+    return codes
+
+
+def price_ranges(prices, edges=PRICE_RANGE_EDGES, labels=None):
+    """Vectorized ``pd.cut(prices, bins=edges, labels=labels)``.
+
+    Without ``labels`` the bins are named by :func:`bin_labels`:
+
+    >>> list(price_ranges([10, 200], edges=[0, 100, np.inf]))
+    ['(0.0, 100.0]', '(100.0, inf]']
+    """
+    codes = bin_codes(np.asarray(prices, dtype="float64"), edges)
+    labels = bin_labels(check_edges(edges), labels)
+    return pd.Categorical.from_codes(codes, categories=labels, ordered=True)
+
+
+class PriceCube:
+    """Prices sorted within each borough, with prefix sums for re-binning."""
+
+    def __init__(self, boroughs, prices):
+        codes, self.boroughs = pd.factorize(pd.Series(boroughs), sort=True)
+        prices = np.asarray(prices, dtype="float64")
+        keep = (codes >= 0) & ~np.isnan(prices)
+        codes, prices = codes[keep], prices[keep]
+        order = np.lexsort((prices, codes))
+        self.prices = prices[order]
+        self.offsets = np.searchsorted(codes[order], np.arange(len(self.boroughs) + 1))
+        self.prefix_sums = np.concatenate([[0.0], np.cumsum(self.prices)])
+
+    @classmethod
+    def from_frame(cls, airbnb_merged):
+        """Build from a frame with ``price`` and ``borough`` or ``nbhood_full``."""
+        if "borough" in airbnb_merged:
+            boroughs = airbnb_merged["borough"]
+        else:
+            boroughs = airbnb_merged["nbhood_full"].map(borough_of)
+        return cls(boroughs.to_numpy(), airbnb_merged["price"].to_numpy())
+
+    def bin(self, edges=PRICE_RANGE_EDGES, labels=None):
+        """Dense count and sum matrices, boroughs x bins."""
+        edges = check_edges(edges)
+        labels = bin_labels(edges, labels)
+        counts = np.empty((len(self.boroughs), len(edges) - 1), dtype="int64")
+        sums = np.empty(counts.shape, dtype="float64")
+        for i in range(len(self.boroughs)):
+            start, stop = self.offsets[i], self.offsets[i + 1]
+            # right-closed bins: position after the last price <= each edge
+            positions = start + np.searchsorted(self.prices[start:stop], edges, side="right")
+            counts[i] = np.diff(positions)
+            sums[i] = np.diff(self.prefix_sums[positions])
+        index = pd.Index(self.boroughs, name="borough")
+        columns = pd.CategoricalIndex(labels, categories=labels, ordered=True, name="price_range")
+        return (pd.DataFrame(counts, index=index, columns=columns),
+                pd.DataFrame(sums, index=index, columns=columns))
+
+    def prices_by_borough(self, edges=PRICE_RANGE_EDGES, labels=None):
+        """The notebook's ``prices_by_borough`` counts.
+
+        Like the notebook's ``groupby`` on the categorical ``price_range``
+        (``observed=True``), combinations without listings are left out.
+        """
+        counts, _ = self.bin(edges, labels)
+        counts = counts.stack()
+        return counts[counts > 0].rename("price_range")
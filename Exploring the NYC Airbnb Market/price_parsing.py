@@ -0,0 +1,123 @@
+"""Fast parsing of the ``"225 dollars"`` prices in ``airbnb_price.csv``.
+
+The notebook cleans prices with ``str.replace(" dollars", '')`` followed by
+``pd.to_numeric``, which walks every row as a Python string twice. Here the
+CSV is read with pyarrow, whose string columns are one contiguous byte
+buffer plus an offsets array, and the digits in front of the suffix are
+decoded with a handful of vectorized numpy operations on those bytes. Rows
+the byte kernel does not recognize (decimals, a missing suffix, stray
+spaces, ...) go through the notebook's own ``str.replace``/``pd.to_numeric``
+conversion, so odd values are still parsed or rejected exactly as before.
+
+Usage from the notebook directory::
+
+    from price_parsing import read_prices
+
+    prices = read_prices("datasets/airbnb_price.csv")
+"""
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+except ImportError:  # pragma: no cover - pyarrow is optional
+    pa = None
+
+PRICES_PATH = "datasets/airbnb_price.csv"
+PRICE_SUFFIX = " dollars"
+# longest integer part decoded by the byte kernel; anything longer falls back
+MAX_DIGITS = 15
+
+
+def decode_prices(offsets, data, suffix=PRICE_SUFFIX.encode()):
+    """Decode ``<digits><suffix>`` strings given as Arrow offsets and bytes.
+
+    Returns the integer values and a mask of the rows that matched.
+    """
+    starts, ends = offsets[:-1], offsets[1:]
+    n = len(starts)
+    if len(data) == 0:
+        return np.zeros(n, dtype="int64"), np.zeros(n, dtype=bool)
+    last = len(data) - 1
+
+    number_ends = ends - len(suffix)
+    lengths = number_ends - starts
+    matched = (lengths >= 1) & (lengths <= MAX_DIGITS)
+    for i, byte in enumerate(suffix):
+        matched &= data[np.clip(number_ends + i, 0, last)] == byte
+
+    values = np.zeros(n, dtype="int64")
+    width = int(lengths[matched].max()) if matched.any() else 0
+    for j in range(width):
+        active = matched & (j < lengths)
+        digits = data[np.clip(starts + j, 0, last)].astype("int64") - 48
+        matched &= ~active | ((digits >= 0) & (digits <= 9))
+        values = np.where(active, values * 10 + digits, values)
+    return values, matched
+
+
+def parse_price_array(array):
+    """Numeric prices of a pyarrow string array (one chunk)."""
+    if pa.types.is_large_string(array.type):
+        offset_type = "int64"
+    elif pa.types.is_string(array.type):
+        offset_type = "int32"
+    else:
+        array = array.cast(pa.string())
+        offset_type = "int32"
+    _, offsets_buffer, data_buffer = array.buffers()
+    offsets = np.frombuffer(offsets_buffer, dtype=offset_type)[array.offset:array.offset + len(array) + 1]
+    data = np.frombuffer(data_buffer, dtype="uint8") if data_buffer is not None else np.zeros(0, "uint8")
+
+    values, matched = decode_prices(offsets.astype("int64"), data)
+    valid = array.is_valid().to_numpy(zero_copy_only=False)
+    matched &= valid
+    if matched.all():
+        return values
+
+    result = values.astype("float64")
+    result[~valid] = np.nan
+    odd = valid & ~matched
+    if odd.any():
+        raw = pd.Series(array.filter(pa.array(odd)).to_pylist())
+        result[odd] = pd.to_numeric(raw.str.replace(PRICE_SUFFIX, "")).to_numpy(dtype="float64")
+    return result
+
+
+def parse_prices(values):
+    """Convert ``"225 dollars"`` strings to numbers.
+
+    Accepts a pandas Series, a list or a pyarrow (chunked) array. The result
+    is an int64 array when every price is a whole number, float64 otherwise,
+    the same dtypes ``pd.to_numeric`` picks in the notebook.
+    """
+    if pa is None:
+        series = pd.Series(values)
+        return pd.to_numeric(series.str.replace(PRICE_SUFFIX, "")).to_numpy()
+    if isinstance(values, pd.Series):
+        values = pa.array(values.astype(object), type=pa.string(), from_pandas=True)
+    elif not isinstance(values, (pa.Array, pa.ChunkedArray)):
+        values = pa.array(values, type=pa.string(), from_pandas=True)
+    chunks = values.chunks if isinstance(values, pa.ChunkedArray) else [values]
+    parts = [parse_price_array(chunk) for chunk in chunks]
+    if not parts:
+        return np.zeros(0, dtype="int64")
+    if any(part.dtype.kind == "f" for part in parts):
+        parts = [part.astype("float64") for part in parts]
+    return np.concatenate(parts)
+
+
+def read_prices(path=PRICES_PATH):
+    """Read ``airbnb_price.csv`` with ``price`` already numeric."""
+    if pa is None:
+        prices = pd.read_csv(path, sep=",")
+        prices["price"] = parse_prices(prices["price"])
+        return prices
+    # strings_can_be_null: empty and "NA"-like fields are missing, as in pd.read_csv
+    table = pa_csv.read_csv(path, convert_options=pa_csv.ConvertOptions(strings_can_be_null=True))
+    price = parse_prices(table.column("price"))
+    prices = table.drop_columns(["price"]).to_pandas()
+    prices.insert(table.column_names.index("price"), "price", price)
+    return prices
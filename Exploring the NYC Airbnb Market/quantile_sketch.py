@@ -0,0 +1,76 @@
+"""Mergeable quantile sketch for listing prices.
+
+Medians cannot be combined from per-shard medians. :class:`QuantileSketch`
+is a DDSketch-style histogram: positive values fall into logarithmically
+spaced buckets ``gamma ** (i - 1) < x <= gamma ** i`` with
+``gamma = (1 + alpha) / (1 - alpha)``, so every quantile it returns is within
+a relative error ``alpha`` of a true data value. Sketches of different
+shards merge exactly by adding bucket counts, and their size only grows
+with the logarithm of the price range, not with the number of listings.
+"""
+
+import numpy as np
+
+RELATIVE_ACCURACY = 0.01
+
+
+class QuantileSketch:
+    """Log-bucket histogram with relative accuracy ``alpha``."""
+
+    def __init__(self, alpha=RELATIVE_ACCURACY):
+        self.alpha = alpha
+        self.gamma = (1 + alpha) / (1 - alpha)
+        self.log_gamma = np.log(self.gamma)
+        self.buckets = {}
+        self.zeros = 0
+        self.count = 0
+
+    def add(self, values):
+        """Add an array of non-negative values."""
+        values = np.asarray(values, dtype="float64")
+        values = values[~np.isnan(values)]
+        if (values < 0).any():
+            raise ValueError("prices must not be negative")
+        positive = values[values > 0]
+        self.zeros += len(values) - len(positive)
+        self.count += len(values)
+        keys, counts = np.unique(np.ceil(np.log(positive) / self.log_gamma).astype("int64"),
+                                 return_counts=True)
+        for key, count in zip(keys.tolist(), counts.tolist()):
+            self.buckets[key] = self.buckets.get(key, 0) + count
+        return self
+
+    def merge(self, other):
+        if other.alpha != self.alpha:
+            raise ValueError("cannot merge sketches with different accuracy")
+        for key, count in other.buckets.items():
+            self.buckets[key] = self.buckets.get(key, 0) + count
+        self.zeros += other.zeros
+        self.count += other.count
+        return self
+
+    def value_at_rank(self, rank):
+        """Approximate value of the ``rank``-th smallest item (0-based)."""
+        if rank < self.zeros:
+            return 0.0
+        seen = self.zeros
+        for key in sorted(self.buckets):
+            seen += self.buckets[key]
+            if rank < seen:
+                # midpoint of the bucket in relative terms
+                return 2 * self.gamma ** key / (self.gamma + 1)
+        raise IndexError(rank)
+
+    def quantile(self, q):
+        if not self.count:
+            return float("nan")
+        return self.value_at_rank(int(q * (self.count - 1)))
+
+    def median(self):
+        """Median, averaging the two middle items for even counts like pandas."""
+        if not self.count:
+            return float("nan")
+        middle = self.count // 2
+        if self.count % 2:
+            return self.value_at_rank(middle)
+        return (self.value_at_rank(middle - 1) + self.value_at_rank(middle)) / 2
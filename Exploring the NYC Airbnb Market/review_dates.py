@@ -0,0 +1,67 @@
+"""Format-aware parsing of ``last_review`` dates with one conversion per date.
+
+``pd.to_datetime(reviews["last_review"])`` infers the ``"May 21 2019"``
+format and converts every row, but a review dump of millions of rows holds
+only a few thousand distinct dates. :func:`parse_review_dates` factorizes
+the column, detects the format once on the distinct strings, converts each
+distinct string once with that explicit format and maps the results back
+through the integer codes. The earliest and latest review fall out of the
+distinct dates for free.
+
+Usage from the notebook directory::
+
+    from review_dates import parse_review_dates
+
+    reviews["last_review"], first_reviewed, last_reviewed = \\
+        parse_review_dates(reviews["last_review"])
+"""
+
+import numpy as np
+import pandas as pd
+
+# tried in order; the first one that parses every distinct string wins
+REVIEW_DATE_FORMATS = ["%B %d %Y", "%b %d %Y", "%Y-%m-%d", "%m/%d/%Y", "%d %B %Y"]
+
+
+def detect_date_format(values, formats=REVIEW_DATE_FORMATS):
+    """First format in ``formats`` that parses all of ``values``, or ``None``."""
+    for fmt in formats:
+        try:
+            pd.to_datetime(values, format=fmt)
+        except (ValueError, TypeError):
+            continue
+        return fmt
+    return None
+
+
+def parse_review_dates(values, formats=REVIEW_DATE_FORMATS):
+    """Parse a column of review date strings.
+
+    Returns ``(dates, first_reviewed, last_reviewed)``: a datetime64 Series
+    aligned with ``values`` and the earliest and latest dates as
+    ``datetime.date`` objects, like the notebook's ``.dt.date.min()`` and
+    ``.dt.date.max()``. Unknown formats fall back to pandas' inference.
+
+    A column without any date, such as a shard with no reviews, gives
+    all-NaT dates:
+
+    >>> dates, first_reviewed, last_reviewed = parse_review_dates([None, np.nan])
+    >>> dates.isna().all(), first_reviewed
+    (np.True_, None)
+    """
+    values = pd.Series(values)
+    codes, uniques = pd.factorize(values)
+    uniques = pd.Series(uniques)
+    fmt = detect_date_format(uniques, formats)
+    parsed = pd.to_datetime(uniques, format=fmt) if fmt else pd.to_datetime(uniques)
+
+    parsed = parsed.to_numpy()
+    # missing values have code -1, which picks the NaT slot at the end
+    lookup = np.append(parsed, np.array(["NaT"], dtype=parsed.dtype))
+    dates = pd.Series(lookup[codes], index=values.index, name=values.name)
+    parsed = pd.Series(parsed)
+    if parsed.notna().any():
+        first_reviewed, last_reviewed = parsed.min().date(), parsed.max().date()
+    else:
+        first_reviewed = last_reviewed = None
+    return dates, first_reviewed, last_reviewed
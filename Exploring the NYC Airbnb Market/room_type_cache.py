@@ -0,0 +1,92 @@
+"""Columnar sidecar for ``airbnb_room_type.xlsx``.
+
+Parsing the workbook is the slowest input of the notebook: openpyxl walks
+the sheet XML cell by cell. The first load parses the first sheet once and
+writes an uncompressed Feather (Arrow IPC) file next to the workbook, with
+``room_type`` stored as a categorical (dictionary-encoded). The size and
+mtime of the workbook are kept in the sidecar metadata, so editing the
+workbook invalidates it, and later loads memory-map the sidecar instead of
+opening the workbook at all.
+
+Usage from the notebook directory::
+
+    from room_type_cache import load_room_types
+
+    room_types = load_room_types("datasets/airbnb_room_type.xlsx")
+"""
+
+import json
+import os
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+ROOM_TYPES_PATH = "datasets/airbnb_room_type.xlsx"
+SIDECAR_METADATA_KEY = b"room_type_source"
+
+
+def excel_engine():
+    """The calamine reader when installed (much faster), else pandas' default."""
+    try:
+        import python_calamine  # noqa: F401
+    except ImportError:
+        return None
+    return "calamine"
+
+
+def default_sidecar_path(path):
+    return os.path.splitext(path)[0] + ".feather"
+
+
+def source_key(path):
+    stat = os.stat(path)
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def read_sidecar_key(sidecar_path):
+    """Workbook key stored in an existing sidecar, or ``None``."""
+    if not os.path.exists(sidecar_path):
+        return None
+    try:
+        with pa.memory_map(sidecar_path) as source:
+            metadata = pa.ipc.open_file(source).schema.metadata or {}
+    except (pa.ArrowInvalid, OSError):
+        return None
+    if SIDECAR_METADATA_KEY not in metadata:
+        return None
+    return json.loads(metadata[SIDECAR_METADATA_KEY])
+
+
+def write_room_type_sidecar(path=ROOM_TYPES_PATH, sidecar_path=None):
+    """Parse the first sheet of the workbook and write the sidecar."""
+    sidecar_path = sidecar_path or default_sidecar_path(path)
+    room_types = pd.read_excel(path, sheet_name=0, engine=excel_engine())
+    room_types["room_type"] = room_types["room_type"].astype("category")
+
+    table = pa.Table.from_pandas(room_types, preserve_index=False)
+    metadata = dict(table.schema.metadata or {})
+    metadata[SIDECAR_METADATA_KEY] = json.dumps(source_key(path))
+    table = table.replace_schema_metadata(metadata)
+
+    tmp_path = sidecar_path + ".tmp"
+    feather.write_feather(table, tmp_path, compression="uncompressed")
+    os.replace(tmp_path, sidecar_path)
+    return sidecar_path
+
+
+def read_room_type_table(path=ROOM_TYPES_PATH, sidecar_path=None):
+    """Memory-mapped Arrow table of the sidecar, refreshed first if stale."""
+    sidecar_path = sidecar_path or default_sidecar_path(path)
+    if read_sidecar_key(sidecar_path) != source_key(path):
+        write_room_type_sidecar(path, sidecar_path)
+    return feather.read_table(sidecar_path, memory_map=True)
+
+
+def load_room_types(path=ROOM_TYPES_PATH, sidecar_path=None):
+    """Return the first sheet of the workbook, from the sidecar when it is current.
+
+    ``room_type`` keeps the workbook's spelling; the notebook's
+    ``str.lower()`` cleaning step works on the categorical unchanged.
+    """
+    return read_room_type_table(path, sidecar_path).to_pandas()
@@ -0,0 +1,156 @@
+"""Incremental upserts and deletes of catalogue rows, keyed by ``show_id``.
+
+The notebook rereads ``netflix_data.csv`` whenever the catalogue changes.
+:class:`Catalogue` instead keeps every title by ``show_id`` together with
+the set of movie ids and running duration statistics of the movies per
+release year and per genre (``count``, ``sum`` and the number of short
+movies, hence ``mean``). :meth:`Catalogue.apply_delta` removes each changed
+or deleted title from the statistics and adds the new version back, so a
+day's delta costs time proportional to its number of rows. Quantiles are
+not kept incrementally; rebuild a :mod:`duration_cube` for those.
+
+Usage from the notebook directory::
+
+    from catalogue_updates import Catalogue
+
+    catalogue = Catalogue.from_csv("datasets/netflix_data.csv")
+    catalogue.apply_delta(upserts=delta_frame, deletes=["s12", "s431"])
+    netflix_movies_col_subset = catalogue.movies()
+    catalogue.year_table()["mean"]
+"""
+
+import pandas as pd
+
+from duration_cube import SHORT_MOVIE_MINUTES
+from netflix_loader import MOVIE_COLUMNS, NETFLIX_PATH
+
+KEY = "show_id"
+CATALOGUE_COLUMNS = ["type", "title", "country", "date_added", "genre", "release_year", "duration"]
+
+
+def missing(value):
+    return value is None or value is pd.NA or value != value
+
+
+class DurationStats:
+    """Running ``count``/``sum`` of durations and the number of short movies."""
+
+    def __init__(self):
+        self.count = 0
+        self.sum = 0
+        self.short = 0
+
+    def add(self, duration):
+        self.count += 1
+        self.sum += duration
+        self.short += duration < SHORT_MOVIE_MINUTES
+
+    def remove(self, duration):
+        self.count -= 1
+        self.sum -= duration
+        self.short -= duration < SHORT_MOVIE_MINUTES
+
+    @property
+    def mean(self):
+        return self.sum / self.count
+
+
+class Catalogue:
+    """Titles by ``show_id`` with movie duration statistics per year and genre."""
+
+    def __init__(self):
+        self.titles = {}
+        self.movie_ids = {}
+        self.by_year = {}
+        self.by_genre = {}
+
+    @classmethod
+    def from_frame(cls, netflix_df):
+        """Start from a frame with ``show_id`` and the catalogue columns."""
+        catalogue = cls()
+        columns = [name for name in CATALOGUE_COLUMNS if name in netflix_df]
+        for show_id, *values in netflix_df[[KEY] + columns].itertuples(index=False):
+            catalogue.insert(show_id, **dict(zip(columns, values)))
+        return catalogue
+
+    @classmethod
+    def from_csv(cls, path=NETFLIX_PATH):
+        return cls.from_frame(pd.read_csv(path, usecols=[KEY] + CATALOGUE_COLUMNS))
+
+    def insert(self, show_id, **row):
+        if show_id in self.titles:
+            raise KeyError("title {} already exists".format(show_id))
+        row = {name: None if missing(row.get(name)) else row.get(name)
+               for name in CATALOGUE_COLUMNS}
+        self.titles[show_id] = row
+        if row["type"] == "Movie":
+            self.movie_ids[show_id] = None
+            self.count_movie(row, DurationStats.add)
+
+    def delete(self, show_id):
+        row = self.titles.pop(show_id)
+        if show_id in self.movie_ids:
+            del self.movie_ids[show_id]
+            self.count_movie(row, DurationStats.remove)
+
+    def upsert(self, show_id, **row):
+        """Insert a title, or change the given columns of an existing one."""
+        if show_id in self.titles:
+            row = dict(self.titles[show_id], **row)
+            self.delete(show_id)
+        self.insert(show_id, **row)
+
+    def apply_delta(self, upserts=None, deletes=()):
+        """Apply a frame of new or changed rows and an iterable of deleted ids.
+
+        Columns missing from ``upserts`` keep their current values; a null
+        in a column that is present clears the field, and a movie without a
+        duration (or year, or genre) leaves the matching statistics:
+
+        >>> catalogue = Catalogue()
+        >>> catalogue.insert("s1", type="Movie", genre="Dramas", release_year=2019, duration=90)
+        >>> catalogue.apply_delta(pd.DataFrame({"show_id": ["s1"], "duration": [None]}))
+        >>> catalogue.titles["s1"]["duration"], catalogue.genre_table().empty
+        (None, True)
+        """
+        for show_id in deletes:
+            self.delete(show_id)
+        if upserts is None:
+            return
+        columns = [name for name in CATALOGUE_COLUMNS if name in upserts]
+        for show_id, *values in upserts[[KEY] + columns].itertuples(index=False):
+            self.upsert(show_id, **dict(zip(columns, values)))
+
+    def count_movie(self, row, change):
+        duration = row["duration"]
+        if duration is None:
+            return
+        for groups, key in ((self.by_year, row["release_year"]), (self.by_genre, row["genre"])):
+            if key is None:
+                continue
+            stats = groups.setdefault(key, DurationStats())
+            change(stats, duration)
+            if not stats.count:
+                del groups[key]
+
+    def movies(self, columns=MOVIE_COLUMNS):
+        """The notebook's movie subset, indexed by ``show_id``."""
+        ids = list(self.movie_ids)
+        movies = pd.DataFrame([self.titles[show_id] for show_id in ids],
+                              index=pd.Index(ids, name=KEY), columns=CATALOGUE_COLUMNS)
+        return movies[list(columns)]
+
+    def year_table(self):
+        """Movie ``count``, ``sum``, ``mean`` and ``short`` per release year."""
+        return self.table(self.by_year, "release_year")
+
+    def genre_table(self):
+        """Movie ``count``, ``sum``, ``mean`` and ``short`` per genre."""
+        return self.table(self.by_genre, "genre")
+
+    @staticmethod
+    def table(groups, name):
+        return pd.DataFrame(
+            [(stats.count, stats.sum, stats.mean, stats.short) for stats in groups.values()],
+            index=pd.Index(list(groups), name=name),
+            columns=["count", "sum", "mean", "short"]).sort_index()
@@ -0,0 +1,86 @@
+"""Binary, memory-mapped RGBA color table for the genre-colored scatter.
+
+``datasets/color_data.csv`` is one line of 21,508 floats: an RGBA color for
+each of the 5,377 movies of ``netflix_movies_col_subset``, in that order.
+:func:`load_color_table` parses the text once into a float32 ``(N, 4)``
+array saved as ``.npy`` next to the CSV and memory-maps it afterwards. A
+JSON sidecar records the CSV's size and mtime, and any change to either
+rebuilds the table. The array can be passed straight to
+``plt.scatter(..., c=table)``; :func:`color_palette` factors it into the
+handful of distinct colors plus one small integer code per movie, so
+subsets are colored by indexing, without any per-point Python work.
+
+Usage from the notebook directory::
+
+    from color_table import color_palette, load_color_table
+
+    table = load_color_table()
+    plt.scatter(netflix_movies_col_subset["release_year"],
+                netflix_movies_col_subset["duration"], c=table)
+
+    colors, codes = color_palette(table)
+    short = (netflix_movies_col_subset["duration"] < 60).to_numpy()
+    short_colors = colors[codes[short]]
+"""
+
+import json
+import os
+
+import numpy as np
+
+COLOR_DATA_PATH = "datasets/color_data.csv"
+
+
+def default_npy_path(csv_path):
+    return os.path.splitext(csv_path)[0] + ".npy"
+
+
+def source_key(path):
+    stat = os.stat(path)
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def key_path_of(npy_path):
+    return npy_path + ".json"
+
+
+def convert_color_data(csv_path=COLOR_DATA_PATH, npy_path=None):
+    """Parse the comma-separated RGBA values and save them as ``.npy``."""
+    npy_path = npy_path or default_npy_path(csv_path)
+    with open(csv_path) as f:
+        values = np.array(f.read().replace("\n", ",").strip(",").split(","), dtype="float32")
+    if len(values) % 4:
+        raise ValueError("%s holds %d values, not RGBA quadruples" % (csv_path, len(values)))
+    tmp_path = npy_path + ".tmp.npy"
+    np.save(tmp_path, values.reshape(-1, 4))
+    os.replace(tmp_path, npy_path)
+    with open(key_path_of(npy_path), "w") as f:
+        json.dump(source_key(csv_path), f)
+    return npy_path
+
+
+def is_current(csv_path, npy_path):
+    """Whether ``npy_path`` was converted from the current ``csv_path``."""
+    if not os.path.exists(npy_path) or not os.path.exists(key_path_of(npy_path)):
+        return False
+    with open(key_path_of(npy_path)) as f:
+        return json.load(f) == source_key(csv_path)
+
+
+def load_color_table(csv_path=COLOR_DATA_PATH, npy_path=None):
+    """Read-only memory-mapped ``(N, 4)`` float32 RGBA table."""
+    npy_path = npy_path or default_npy_path(csv_path)
+    if not is_current(csv_path, npy_path):
+        convert_color_data(csv_path, npy_path)
+    return np.load(npy_path, mmap_mode="r")
+
+
+def color_palette(table):
+    """Distinct colors of ``table`` and each row's index into them.
+
+    ``colors[codes]`` rebuilds the table; ``colors[codes[selection]]``
+    colors any subset of the movies.
+    """
+    colors, codes = np.unique(np.asarray(table), axis=0, return_inverse=True)
+    dtype = np.uint8 if len(colors) <= 256 else np.int32
+    return colors, codes.reshape(-1).astype(dtype)
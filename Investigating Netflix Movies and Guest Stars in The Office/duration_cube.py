@@ -0,0 +1,150 @@
+"""Precomputed duration statistics per release year and genre.
+
+The notebook judges whether movies are getting shorter by eyeballing a
+scatter plot and a hard-coded list of yearly averages. :class:`DurationCube`
+computes the statistics directly: for every release year, every genre and
+every (year, genre) pair it holds the movie count, mean, median, a few
+quantiles and the number of short movies (``duration < 60``), together
+with the notebook's ``short_movies`` listing.
+
+Each table comes from one sort of the durations by group; group sizes,
+sums and quantile positions are then read off the sorted array with
+vectorized operations, so there is no per-group Python loop. Quantiles use
+pandas' default linear interpolation. :func:`load_duration_cube` caches
+the tables as Feather files keyed by the size and mtime of the source CSV,
+so trend queries do not rescan the catalogue.
+
+Usage from the notebook directory::
+
+    from duration_cube import load_duration_cube
+
+    cube = load_duration_cube("datasets/netflix_data.csv")
+    cube.by_year["mean"]                 # the notebook's ``durations``
+    cube.trend(genre="Documentaries")
+    short_movies = cube.short_movies
+"""
+
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from netflix_loader import NETFLIX_PATH, load_titles
+
+SHORT_MOVIE_MINUTES = 60
+QUANTILES = (0.25, 0.75)
+TABLES = ("by_year", "by_genre", "by_year_genre", "short_movies")
+
+
+def quantile_name(q):
+    return "q%d" % round(q * 100)
+
+
+def sorted_quantiles(values, starts, counts, q):
+    """Linear-interpolated ``q`` quantile of each sorted group."""
+    position = starts + q * (counts - 1)
+    lo = np.floor(position).astype("int64")
+    hi = np.minimum(lo + 1, starts + counts - 1)
+    return values[lo] + (values[hi] - values[lo]) * (position - lo)
+
+
+def grouped_duration_stats(titles, keys, short_minutes=SHORT_MOVIE_MINUTES, quantiles=QUANTILES):
+    """Duration statistics of ``titles`` grouped by the ``keys`` columns."""
+    titles = titles.dropna(subset=list(keys) + ["duration"])
+    # plain arrays, so categoricals are sorted by value, not category order
+    codes = [pd.factorize(np.asarray(titles[key]), sort=True) for key in keys]
+    durations = titles["duration"].to_numpy(dtype="float64")
+    # lexsort: last key is primary, so durations sort within the groups
+    order = np.lexsort([durations] + [code for code, _ in reversed(codes)])
+    durations = durations[order]
+    group_codes = [code[order] for code, _ in codes]
+
+    boundary = np.ones(len(order), dtype=bool)
+    if len(order):
+        boundary[1:] = np.any([code[1:] != code[:-1] for code in group_codes], axis=0)
+    starts = np.flatnonzero(boundary)
+    counts = np.diff(np.append(starts, len(order)))
+
+    stats = pd.DataFrame({
+        "count": counts,
+        "mean": np.add.reduceat(durations, starts) / counts if len(starts) else [],
+        "median": sorted_quantiles(durations, starts, counts, 0.5),
+    })
+    for q in quantiles:
+        stats[quantile_name(q)] = sorted_quantiles(durations, starts, counts, q)
+    short = (durations < short_minutes).astype("int64")
+    stats["short"] = np.add.reduceat(short, starts) if len(starts) else []
+    stats.index = pd.MultiIndex.from_arrays(
+        [uniques[code[starts]] for code, (_, uniques) in zip(group_codes, codes)], names=list(keys))
+    if len(keys) == 1:
+        stats.index = stats.index.get_level_values(0)
+    return stats
+
+
+class DurationCube:
+    """Duration statistics by year, by genre and by both, plus short movies."""
+
+    def __init__(self, by_year, by_genre, by_year_genre, short_movies):
+        self.by_year = by_year
+        self.by_genre = by_genre
+        self.by_year_genre = by_year_genre
+        self.short_movies = short_movies
+
+    @classmethod
+    def build(cls, titles, short_minutes=SHORT_MOVIE_MINUTES, quantiles=QUANTILES):
+        """Compute every table from a frame of movies."""
+        return cls(
+            grouped_duration_stats(titles, ["release_year"], short_minutes, quantiles),
+            grouped_duration_stats(titles, ["genre"], short_minutes, quantiles),
+            grouped_duration_stats(titles, ["release_year", "genre"], short_minutes, quantiles),
+            titles[titles["duration"] < short_minutes],
+        )
+
+    def trend(self, statistic="mean", genre=None):
+        """One statistic per release year, overall or for one genre."""
+        if genre is None:
+            return self.by_year[statistic]
+        return self.by_year_genre[statistic].xs(genre, level="genre")
+
+    def save(self, cache_dir, source_key):
+        os.makedirs(cache_dir, exist_ok=True)
+        for name in TABLES:
+            getattr(self, name).reset_index().to_feather(os.path.join(cache_dir, name + ".feather"))
+        with open(os.path.join(cache_dir, "source.json"), "w") as f:
+            json.dump(source_key, f)
+
+    @classmethod
+    def load(cls, cache_dir):
+        tables = {}
+        for name in TABLES:
+            table = pd.read_feather(os.path.join(cache_dir, name + ".feather"))
+            index = {"by_year": ["release_year"], "by_genre": ["genre"],
+                     "by_year_genre": ["release_year", "genre"]}.get(name, ["index"])
+            table = table.set_index(index)
+            if name == "short_movies":
+                table.index.name = None
+            tables[name] = table
+        return cls(**tables)
+
+
+def source_key(path):
+    stat = os.stat(path)
+    return {"path": os.path.abspath(path), "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def default_cache_dir(path):
+    return os.path.splitext(path)[0] + "_duration_cube"
+
+
+def load_duration_cube(path=NETFLIX_PATH, cache_dir=None):
+    """The cube of ``path``'s movies, from the cache when the CSV is unchanged."""
+    cache_dir = cache_dir or default_cache_dir(path)
+    key_path = os.path.join(cache_dir, "source.json")
+    if os.path.exists(key_path):
+        with open(key_path) as f:
+            if json.load(f) == source_key(path):
+                return DurationCube.load(cache_dir)
+    cube = DurationCube.build(load_titles(path))
+    cube.save(cache_dir, source_key(path))
+    return cube
@@ -0,0 +1,252 @@
+"""Inverted index of the people in ``cast`` and ``director``.
+
+``cast`` and ``director`` in ``netflix_data.csv`` are comma-joined
+strings, so finding the titles of one guest star means a substring scan
+over the whole table. :func:`load_people_index` factorizes ``show_id``
+into dense ``int32`` title codes (any id scheme works; the ids are kept
+in a table to map codes back) and tokenizes both columns once into a
+:class:`PostingIndex` per role: the sorted, distinct names as one UTF-8
+byte string with offsets, and for each name a sorted posting list of
+title codes, stored back to back with an offsets array. A reverse table
+of the same shape maps every title to its people, for co-star counts.
+
+Lookups are a binary search over the encoded names (UTF-8 byte order is
+code point order, so the names stay sorted), co-appearances intersect
+sorted arrays, and "most frequent" queries are a ``bincount``. The arrays
+are cached in an ``.npz`` next to the CSV, keyed by the CSV's size and
+mtime.
+
+Usage from the notebook directory::
+
+    from people_index import load_people_index
+
+    people = load_people_index("datasets/netflix_data.csv")
+    people.cast.show_ids("Steve Carell")
+    people.titles(cast=["Steve Carell", "Rainn Wilson"])
+    people.cast.most_frequent(10)
+    people.cast.co_stars("Steve Carell", 5)
+"""
+
+import os
+from bisect import bisect_left
+
+import numpy as np
+import pandas as pd
+
+from netflix_loader import NETFLIX_PATH
+
+ROLES = ("cast", "director")
+INDEX_ARRAYS = ("name_bytes", "name_offsets", "offsets", "postings", "title_offsets", "people")
+ID_ARRAYS = ("id_bytes", "id_offsets")
+
+
+def csr(groups, members, n_groups):
+    """Offsets and members of ``members`` grouped by ``groups`` (both sorted)."""
+    offsets = np.zeros(n_groups + 1, dtype="int64")
+    np.cumsum(np.bincount(groups, minlength=n_groups), out=offsets[1:])
+    return offsets, members
+
+
+def encode_strings(strings):
+    """Concatenated UTF-8 bytes of ``strings`` and the offsets between them."""
+    encoded = [string.encode("utf-8") for string in strings]
+    offsets = np.zeros(len(encoded) + 1, dtype="int64")
+    np.cumsum([len(string) for string in encoded], out=offsets[1:])
+    return np.frombuffer(b"".join(encoded), dtype="uint8"), offsets
+
+
+class EncodedStrings:
+    """Read-only sequence of UTF-8 strings, for ``bisect`` and code lookups."""
+
+    def __init__(self, data, offsets):
+        self.data = data
+        self.offsets = offsets
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        return self.data[self.offsets[i]:self.offsets[i + 1]].tobytes()
+
+    def decode(self, codes):
+        return [self[code].decode("utf-8") for code in codes]
+
+
+class PostingIndex:
+    """Sorted title code postings per person, and people per title."""
+
+    def __init__(self, name_bytes, name_offsets, offsets, postings, title_offsets, people,
+                 show_ids):
+        self.name_bytes = name_bytes
+        self.name_offsets = name_offsets
+        self.encoded_names = EncodedStrings(name_bytes, name_offsets)
+        self.offsets = offsets
+        self.postings = postings
+        self.title_offsets = title_offsets
+        self.people = people
+        self.show_id_table = show_ids
+
+    @classmethod
+    def from_column(cls, title_codes, people, show_ids):
+        """Tokenize a comma-joined ``people`` column of titles with ``title_codes``."""
+        names = pd.Series(np.asarray(people, dtype=object), index=title_codes)
+        names = names.dropna().str.split(",").explode().str.strip()
+        names = names[names != ""]
+        codes, uniques = pd.factorize(names.to_numpy(), sort=True)
+        titles = names.index.to_numpy(dtype="int32")
+
+        # person -> sorted, distinct title codes
+        order = np.lexsort((titles, codes))
+        codes, titles = codes[order], titles[order]
+        distinct = np.ones(len(codes), dtype=bool)
+        distinct[1:] = (codes[1:] != codes[:-1]) | (titles[1:] != titles[:-1])
+        codes, titles = codes[distinct], titles[distinct]
+        offsets, postings = csr(codes, titles, len(uniques))
+
+        # title -> person codes; titles without people get empty ranges
+        order = np.lexsort((codes, titles))
+        title_offsets, people = csr(titles[order], codes[order].astype("int32"), len(show_ids))
+        return cls(*encode_strings(uniques), offsets, postings, title_offsets, people, show_ids)
+
+    def __len__(self):
+        return len(self.encoded_names)
+
+    def name(self, code):
+        return self.encoded_names[code].decode("utf-8")
+
+    def names(self, codes):
+        return self.encoded_names.decode(codes)
+
+    def code(self, name):
+        """Position of ``name`` among the sorted names, or -1."""
+        key = name.encode("utf-8")
+        i = bisect_left(self.encoded_names, key)
+        return i if i < len(self) and self.encoded_names[i] == key else -1
+
+    def postings_of(self, name):
+        """Sorted title codes of ``name`` (empty when unknown)."""
+        i = self.code(name)
+        if i < 0:
+            return self.postings[:0]
+        return self.postings[self.offsets[i]:self.offsets[i + 1]]
+
+    def show_ids(self, name):
+        return self.show_id_table.decode(self.postings_of(name))
+
+    def counts(self):
+        """Number of titles per person, by person code."""
+        return np.diff(self.offsets)
+
+    def top(self, counts, codes, n):
+        """The ``n`` largest ``counts[codes]`` as a Series by name, ties by name."""
+        codes = codes[np.argsort(-counts[codes], kind="stable")[:n]]
+        return pd.Series(counts[codes], index=self.names(codes), name="titles")
+
+    def most_frequent(self, n=10):
+        """The ``n`` people with the most titles, as a Series of counts."""
+        return self.top(self.counts(), np.arange(len(self)), n)
+
+    def co_stars(self, name, n=10):
+        """The ``n`` people sharing the most titles with ``name``."""
+        rows = self.postings_of(name)
+        if not len(rows):
+            return pd.Series([], dtype="int64", name="titles")
+        starts, stops = self.title_offsets[rows], self.title_offsets[rows + 1]
+        # concatenated ranges [start, stop) of every title's people
+        lengths = stops - starts
+        positions = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(lengths.sum())
+        counts = np.bincount(self.people[positions], minlength=len(self))
+        counts[self.code(name)] = 0
+        return self.top(counts, np.flatnonzero(counts), n)
+
+    def arrays(self, prefix):
+        return {prefix + name: getattr(self, name) for name in INDEX_ARRAYS}
+
+
+def intersect_postings(postings):
+    """Title codes present in every sorted array of ``postings``."""
+    postings = sorted(postings, key=len)
+    if not postings:
+        return np.zeros(0, dtype="int32")
+    common = postings[0]
+    for other in postings[1:]:
+        common = common[np.isin(common, other, assume_unique=True)]
+    return common
+
+
+class PeopleIndex:
+    """A :class:`PostingIndex` for ``cast`` and one for ``director``.
+
+    ``show_id`` can be any string; titles are numbered in file order:
+
+    >>> frame = pd.DataFrame({"show_id": ["81145628x", "s2", "tt0386676"],
+    ...                       "cast": ["Steve Carell, Rainn Wilson", None, "Steve Carell"],
+    ...                       "director": [None, "Ken Kwapis", "Ken Kwapis"]})
+    >>> people = PeopleIndex.from_frame(frame)
+    >>> people.cast.show_ids("Steve Carell")
+    ['81145628x', 'tt0386676']
+    >>> people.titles(cast=["Steve Carell"], director=["Ken Kwapis"])
+    ['tt0386676']
+    """
+
+    def __init__(self, cast, director, show_ids):
+        self.cast = cast
+        self.director = director
+        self.show_ids = show_ids
+
+    @classmethod
+    def from_frame(cls, netflix_df):
+        title_codes, ids = pd.factorize(netflix_df["show_id"].astype(str))
+        show_ids = EncodedStrings(*encode_strings(ids))
+        return cls(*(PostingIndex.from_column(title_codes, netflix_df[role], show_ids)
+                     for role in ROLES), show_ids)
+
+    def titles(self, cast=(), director=()):
+        """``show_id``s of the titles with all of the given people."""
+        postings = ([self.cast.postings_of(name) for name in cast]
+                    + [self.director.postings_of(name) for name in director])
+        return self.show_ids.decode(intersect_postings(postings))
+
+    def save(self, path, source_key):
+        arrays = {"id_bytes": self.show_ids.data, "id_offsets": self.show_ids.offsets}
+        for role in ROLES:
+            arrays.update(getattr(self, role).arrays(role + "_"))
+        tmp_path = path + ".tmp.npz"
+        np.savez(tmp_path, source_key=np.array(source_key, dtype="int64"), **arrays)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as arrays:
+            show_ids = EncodedStrings(*(arrays[name] for name in ID_ARRAYS))
+            return cls(*(PostingIndex(*(arrays[role + "_" + name] for name in INDEX_ARRAYS),
+                                      show_ids)
+                         for role in ROLES), show_ids)
+
+    @staticmethod
+    def is_current(path, key):
+        """Whether the cache at ``path`` was built from ``key`` with this layout."""
+        with np.load(path) as arrays:
+            names = {role + "_" + name for role in ROLES for name in INDEX_ARRAYS}
+            names.update(ID_ARRAYS)
+            return (names.issubset(arrays.files) and "source_key" in arrays.files
+                    and tuple(arrays["source_key"]) == tuple(key))
+
+
+def source_key(path):
+    stat = os.stat(path)
+    return (stat.st_size, stat.st_mtime_ns)
+
+
+def default_index_path(csv_path):
+    return os.path.splitext(csv_path)[0] + "_people.npz"
+
+
+def load_people_index(path=NETFLIX_PATH, index_path=None):
+    """The people index of ``path``, from the cache when the CSV is unchanged."""
+    index_path = index_path or default_index_path(path)
+    if os.path.exists(index_path) and PeopleIndex.is_current(index_path, source_key(path)):
+        return PeopleIndex.load(index_path)
+    index = PeopleIndex.from_frame(pd.read_csv(path, usecols=["show_id"] + list(ROLES)))
+    index.save(index_path, source_key(path))
+    return index